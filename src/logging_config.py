@@ -1,16 +1,53 @@
 """Logging configuration for memory operations with structured JSON logging."""
 
+import functools
 import json
 import logging
 import os
+import sys
 import time
-from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Optional
+from typing import Any, Optional, TextIO
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to stdlib json
+    orjson = None
 
 
 # Default log level
 DEFAULT_LOG_LEVEL = "INFO"
 
+# Structured fields copied from a record's `extra` into the JSON output
+_EXTRA_FIELDS = (
+    "operation",
+    "user_id",
+    "latency_ms",
+    "result_count",
+    "status",
+    "error_type",
+    "error_message",
+    "api_endpoint",
+)
+
+# Pre-rendered `,"key":` separators for the extra fields, in output order
+_EXTRA_PREFIXES = tuple((key, f',"{key}":') for key in _EXTRA_FIELDS)
+
+# Message logged by LogApiCall on success; such records take a templated fast path
+SUCCESS_MESSAGE = "Memory API call completed"
+
+
+@functools.lru_cache(maxsize=1024)
+def _json_str(value: str) -> str:
+    """JSON-encode a string, caching the result for repeated values."""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _json_value(value: Any) -> str:
+    """JSON-encode a single value compactly without escaping non-ASCII."""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
 
 def get_log_level() -> int:
     """Get the log level from environment variable.
@@ -19,14 +56,13 @@ def get_log_level() -> int:
         Logging level constant (e.g., logging.INFO, logging.DEBUG)
     """
     level_str = os.getenv("LOG_LEVEL", DEFAULT_LOG_LEVEL).upper()
-    level_map = {
-        "DEBUG": logging.DEBUG,
-        "INFO": logging.INFO,
-        "WARNING": logging.WARNING,
-        "ERROR": logging.ERROR,
-        "CRITICAL": logging.CRITICAL,
-    }
-    return level_map.get(level_str, logging.INFO)
+    # Level names are attributes of the logging module (logging.DEBUG, ...)
+    level = getattr(logging, level_str, logging.INFO)
+    return level if isinstance(level, int) else logging.INFO
+
+
+# Resolved once at import; the environment is loaded before this module
+_LOG_LEVEL = get_log_level()
 
 
 class JSONFormatter(logging.Formatter):
@@ -41,37 +77,91 @@ class JSONFormatter(logging.Formatter):
         Returns:
             JSON string representation of the log record
         """
-        log_data: dict[str, Any] = {
-            "timestamp": self.formatTime(record, self.datefmt),
-            "level": record.levelname,
-            "logger": record.name,
-            "message": record.getMessage(),
-        }
+        record_dict = record.__dict__
+        if record.msg is SUCCESS_MESSAGE and not record.args:
+            return self._format_success(record, record_dict)
+
+        # Stream fields straight into the output rather than building a dict
+        parts = [
+            f'{{"timestamp":{_json_value(record.created)},"level":{_json_str(record.levelname)},'
+            f'"logger":{_json_str(record.name)},"message":{_json_value(record.getMessage())}'
+        ]
 
         # Add extra fields if present
-        if hasattr(record, "operation"):
-            log_data["operation"] = record.operation
-        if hasattr(record, "user_id"):
-            log_data["user_id"] = record.user_id
-        if hasattr(record, "latency_ms"):
-            log_data["latency_ms"] = record.latency_ms
-        if hasattr(record, "result_count"):
-            log_data["result_count"] = record.result_count
-        if hasattr(record, "status"):
-            log_data["status"] = record.status
-        if hasattr(record, "error_type"):
-            log_data["error_type"] = record.error_type
-        if hasattr(record, "error_message"):
-            log_data["error_message"] = record.error_message
-        if hasattr(record, "api_endpoint"):
-            log_data["api_endpoint"] = record.api_endpoint
-
-        return json.dumps(log_data)
+        for key, prefix in _EXTRA_PREFIXES:
+            value = record_dict.get(key)
+            if value is not None:
+                parts.append(prefix)
+                parts.append(_json_value(value))
+        parts.append("}")
+        return "".join(parts)
+
+    @staticmethod
+    def _format_success(record: logging.LogRecord, record_dict: dict[str, Any]) -> str:
+        """Render a LogApiCall success record without building a dict.
+
+        Produces the same output as the generic path (orjson or stdlib) for
+        this fixed shape; string fields are escaped through the cached
+        _json_str.
+        """
+        user_id = record_dict.get("user_id")
+        result_count = record_dict.get("result_count")
+        api_endpoint = record_dict.get("api_endpoint")
+
+        parts = [
+            f'{{"timestamp":{record.created!r},"level":{_json_str(record.levelname)},'
+            f'"logger":{_json_str(record.name)},"message":{_json_str(SUCCESS_MESSAGE)},'
+            f'"operation":{_json_str(record_dict["operation"])}'
+        ]
+        if user_id is not None:
+            parts.append(f',"user_id":{_json_str(user_id)}')
+        parts.append(f',"latency_ms":{record_dict["latency_ms"]!r}')
+        if result_count is not None:
+            parts.append(f',"result_count":{result_count:d}')
+        parts.append(',"status":"success"')
+        if api_endpoint is not None:
+            parts.append(f',"api_endpoint":{_json_str(api_endpoint)}')
+        parts.append("}")
+        return "".join(parts)
+
+
+class JSONBytesHandler(logging.Handler):
+    """Handler that writes formatted records as UTF-8 bytes.
+
+    Unlike StreamHandler, each record is encoded once and written together
+    with its newline straight to the stream's binary buffer, bypassing the
+    text layer.
+
+    Args:
+        stream: Text stream to write to; defaults to sys.stderr at emit time
+    """
+
+    terminator = b"\n"
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        super().__init__()
+        self.stream = stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            data = self.format(record).encode("utf-8") + self.terminator
+            stream = self.stream if self.stream is not None else sys.stderr
+            buffer = getattr(stream, "buffer", None)
+            if buffer is None:
+                stream.write(data.decode("utf-8"))
+                stream.flush()
+            else:
+                buffer.write(data)
+                buffer.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
 
 
 def configure_logging() -> None:
     """Configure logging with JSON formatter and environment-based log level."""
-    log_level = get_log_level()
+    log_level = _LOG_LEVEL
 
     # Configure root logger to respect LOG_LEVEL
     logging.basicConfig(level=log_level)
@@ -84,7 +174,7 @@ def configure_logging() -> None:
     logger.handlers = []
 
     # Create console handler with JSON formatter
-    handler = logging.StreamHandler()
+    handler = JSONBytesHandler()
     handler.setFormatter(JSONFormatter())
     logger.addHandler(handler)
 
@@ -92,83 +182,107 @@ def configure_logging() -> None:
     logger.propagate = False
 
 
+# Configure once at import so the memory logger is ready before first use
+configure_logging()
+_memory_logger = logging.getLogger("memory")
+
+
 def get_memory_logger() -> logging.Logger:
     """Get the configured memory logger.
 
     Returns:
         Logger instance for memory operations
     """
-    logger = logging.getLogger("memory")
-    if not logger.handlers:
-        configure_logging()
-    return logger
+    return _memory_logger
+
 
+class LogApiCall:
+    """Async context manager for logging API calls with latency measurement.
 
-@asynccontextmanager
-async def log_api_call(
-    operation: str,
-    user_id: Optional[str] = None,
-    api_endpoint: Optional[str] = None,
-) -> AsyncGenerator[dict[str, Any], None]:
-    """Context manager for logging API calls with latency measurement.
+    Implemented as a class rather than with @asynccontextmanager to avoid the
+    generator machinery on every enter/exit.
 
     Args:
         operation: Name of the operation being performed
         user_id: Optional user identifier (not logged for privacy in some cases)
         api_endpoint: Optional API endpoint being called
 
-    Yields:
-        A dictionary for storing operation results (e.g., result_count)
+    Entering yields a dictionary for storing operation results
+    (e.g., result_count).
     """
-    logger = get_memory_logger()
-    start_time = time.perf_counter()
-    result_context: dict[str, Any] = {}
-
-    try:
-        yield result_context
 
-        # Calculate latency
-        latency_ms = (time.perf_counter() - start_time) * 1000
+    __slots__ = ("operation", "user_id", "api_endpoint", "_enabled", "_start_ns", "ctx")
+
+    def __init__(
+        self,
+        operation: str,
+        user_id: Optional[str] = None,
+        api_endpoint: Optional[str] = None,
+    ) -> None:
+        self.operation = operation
+        self.user_id = user_id
+        self.api_endpoint = api_endpoint
+
+    async def __aenter__(self) -> dict[str, Any]:
+        self.ctx: dict[str, Any] = {}
+        # Skip timing entirely when success records would be filtered out
+        self._enabled = _memory_logger.isEnabledFor(logging.INFO)
+        self._start_ns = time.perf_counter_ns() if self._enabled else 0
+        return self.ctx
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        if not self._enabled:
+            if isinstance(exc, Exception):
+                # Errors are still reported, just without a latency measurement
+                self._log_error(exc, None)
+            return False
 
-        # Log successful operation
-        extra: dict[str, Any] = {
-            "operation": operation,
-            "latency_ms": round(latency_ms, 2),
-            "status": "success",
-        }
-        if user_id:
-            extra["user_id"] = user_id
-        if api_endpoint:
-            extra["api_endpoint"] = api_endpoint
-        if "result_count" in result_context:
-            extra["result_count"] = result_context["result_count"]
-
-        logger.info(
-            "Memory API call completed",
-            extra=extra,
-        )
-
-    except Exception as e:
         # Calculate latency
-        latency_ms = (time.perf_counter() - start_time) * 1000
-
-        # Log failed operation
+        latency_ms = round((time.perf_counter_ns() - self._start_ns) / 1_000_000, 2)
+
+        if exc_type is None:
+            # Log successful operation
+            extra: dict[str, Any] = {
+                "operation": self.operation,
+                "latency_ms": latency_ms,
+                "status": "success",
+            }
+            if self.user_id:
+                extra["user_id"] = self.user_id
+            if self.api_endpoint:
+                extra["api_endpoint"] = self.api_endpoint
+            if "result_count" in self.ctx:
+                extra["result_count"] = self.ctx["result_count"]
+
+            _memory_logger.info(
+                SUCCESS_MESSAGE,
+                extra=extra,
+            )
+
+        elif isinstance(exc, Exception):
+            self._log_error(exc, latency_ms)
+
+        # Never suppress: the exception is re-raised for the caller to handle
+        return False
+
+    def _log_error(self, exc: Exception, latency_ms: Optional[float]) -> None:
+        """Log a failed operation."""
         extra = {
-            "operation": operation,
-            "latency_ms": round(latency_ms, 2),
+            "operation": self.operation,
+            "latency_ms": latency_ms,
             "status": "error",
-            "error_type": type(e).__name__,
-            "error_message": str(e),
+            "error_type": type(exc).__name__,
+            "error_message": str(exc),
         }
-        if user_id:
-            extra["user_id"] = user_id
-        if api_endpoint:
-            extra["api_endpoint"] = api_endpoint
+        if self.user_id:
+            extra["user_id"] = self.user_id
+        if self.api_endpoint:
+            extra["api_endpoint"] = self.api_endpoint
 
-        logger.error(
+        _memory_logger.error(
             "Memory API call failed",
             extra=extra,
         )
 
-        # Re-raise the exception for the caller to handle
-        raise
+
+log_api_call = LogApiCall
@@ -5,13 +5,23 @@ Per Redis agent-memory-server docs:
 - POST /v1/long-term-memory/search - Semantic search
 """
 
+import asyncio
+import contextlib
+import functools
+import itertools
+import json
 import os
-import uuid
+from collections.abc import Iterator
 from typing import Any, Optional
 
 import httpx
 
-from src.logging_config import get_memory_logger, log_api_call
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to stdlib json
+    orjson = None
+
+from src.logging_config import LogApiCall, get_memory_logger
 
 # Get the logger for memory operations
 logger = get_memory_logger()
@@ -22,13 +32,12 @@ DEFAULT_TIMEOUT_SECONDS = 30.0
 # Default memory enabled state
 DEFAULT_ENABLE_MEMORY = True
 
-
-def _get_base_url() -> str:
-    """Get the memory server URL from environment or use default."""
-    return os.getenv("MEMORY_SERVER_URL", "http://localhost:8000")
+# add_memory batching: max entries per POST and how long to wait for more
+MEMORY_BATCH_MAX = 32
+MEMORY_BATCH_WINDOW_SECONDS = 0.05
 
 
-def _get_timeout() -> float:
+def _parse_timeout() -> float:
     """Get the timeout in seconds from environment or use default."""
     timeout_str = os.getenv("MEMORY_TIMEOUT_SECONDS")
     if timeout_str:
@@ -39,6 +48,156 @@ def _get_timeout() -> float:
     return DEFAULT_TIMEOUT_SECONDS
 
 
+def _parse_enabled() -> bool:
+    """Get the memory enabled flag from environment or use default."""
+    enable_str = os.getenv("ENABLE_MEMORY", "true").lower()
+    return enable_str in ("true", "1", "yes", "on")
+
+
+# Memory IDs only need to be unique, so build them from a per-process prefix
+# plus a counter rather than paying for uuid4's CSPRNG read on every add
+_MEMORY_ID_PREFIX = f"jarvis-{os.getpid():04x}{os.urandom(3).hex()}"
+_memory_id_counter = itertools.count()
+
+# Configuration is read once at import; call reload_config() after changing env
+_BASE_URL = os.getenv("MEMORY_SERVER_URL", "http://localhost:8000")
+_TIMEOUT = httpx.Timeout(_parse_timeout())
+_MEMORY_ENABLED = _parse_enabled()
+_LIMITS = httpx.Limits(max_keepalive_connections=20)
+
+
+def reload_config() -> None:
+    """Re-read memory configuration from environment variables.
+
+    Intended for tests that change MEMORY_* variables at runtime.
+    """
+    global _BASE_URL, _TIMEOUT, _MEMORY_ENABLED
+    _BASE_URL = os.getenv("MEMORY_SERVER_URL", "http://localhost:8000")
+    _TIMEOUT = httpx.Timeout(_parse_timeout())
+    _MEMORY_ENABLED = _parse_enabled()
+    if _client is not None:
+        _client.base_url = _BASE_URL
+        _client.timeout = _TIMEOUT
+
+
+@contextlib.contextmanager
+def set_timeout(seconds: float) -> Iterator[None]:
+    """Override the memory API timeout for the duration of a with block.
+
+    Applies to the shared client in place, without touching
+    MEMORY_TIMEOUT_SECONDS or rebuilding the client.
+
+    Args:
+        seconds: Timeout for each request made inside the block
+    """
+    global _TIMEOUT
+    previous = _TIMEOUT
+    _TIMEOUT = httpx.Timeout(seconds)
+    if _client is not None:
+        _client.timeout = _TIMEOUT
+    try:
+        yield
+    finally:
+        _TIMEOUT = previous
+        if _client is not None:
+            _client.timeout = previous
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Memory server endpoints
+_SEARCH_PATH = "/v1/long-term-memory/search"
+_CREATE_PATH = "/v1/long-term-memory/"
+_FORGET_PATH = "/v1/long-term-memory/forget"
+
+# Per-operation LogApiCall factories with the static arguments pre-bound
+_log_search = functools.partial(LogApiCall, "search_memory", api_endpoint=_SEARCH_PATH)
+_log_add = functools.partial(LogApiCall, "add_memory", api_endpoint=_CREATE_PATH)
+_log_get = functools.partial(LogApiCall, "get_memories", api_endpoint=_SEARCH_PATH)
+_log_delete = functools.partial(LogApiCall, "delete_user_memories", api_endpoint=_FORGET_PATH)
+
+
+def _json_body(payload: dict[str, Any]) -> bytes:
+    """Serialize a request payload to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _json_response(response: httpx.Response) -> Any:
+    """Parse a JSON response body."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# Strong references to fire-and-forget add_memory tasks so they aren't GC'd
+_bg_tasks: set[asyncio.Task] = set()
+
+# Shared HTTP client so connections are kept alive and reused across calls
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_client() -> httpx.AsyncClient:
+    """Get the shared memory server HTTP client, creating it on first use.
+
+    The client is bound to the event loop it was created on; a new one is
+    built if called from a different loop (e.g. per-test loops).
+
+    Returns:
+        Connection-pooled AsyncClient for the memory server
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        if _client is not None and not _client.is_closed:
+            # Best effort: release the stale pool's sockets. Closing can fail
+            # when its connections belong to a loop that is already closed.
+            try:
+                await _client.aclose()
+            except Exception as e:
+                logger.debug("Could not close stale memory client: %s", e)
+        _client = httpx.AsyncClient(
+            base_url=_BASE_URL,
+            timeout=_TIMEOUT,
+            limits=_LIMITS,
+        )
+        _client_loop = loop
+    return _client
+
+
+def set_http_client(client: httpx.AsyncClient) -> None:
+    """Use a caller-supplied HTTP client for memory server requests.
+
+    Must be called from the event loop the client will be used on, e.g. to
+    install a client with a custom transport or pool limits. Any existing
+    client is replaced without being closed, and the new one is replaced
+    like any other if later used from a different loop.
+
+    Args:
+        client: AsyncClient whose base_url points at the memory server
+    """
+    global _client, _client_loop
+    _client = client
+    _client_loop = asyncio.get_running_loop()
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client, if one has been created.
+
+    Pending background memory writes are allowed to finish first.
+    """
+    global _client, _client_loop
+    if _bg_tasks:
+        await asyncio.gather(*_bg_tasks, return_exceptions=True)
+    await _writer.close()
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _client_loop = None
+
+
 def is_memory_enabled() -> bool:
     """Check if memory feature is enabled via environment variable.
 
@@ -46,8 +205,7 @@ def is_memory_enabled() -> bool:
         True if memory is enabled, False otherwise.
         Defaults to True if ENABLE_MEMORY is not set.
     """
-    enable_str = os.getenv("ENABLE_MEMORY", "true").lower()
-    return enable_str in ("true", "1", "yes", "on")
+    return _MEMORY_ENABLED
 
 
 async def search_memory(query: str, user_id: str) -> list[dict[str, Any]]:
@@ -64,51 +222,45 @@ async def search_memory(query: str, user_id: str) -> list[dict[str, Any]]:
     Returns:
         List of matching memory objects with text and score
     """
-    if not is_memory_enabled():
+    if not _MEMORY_ENABLED:
         logger.debug(
             "Memory feature disabled, skipping search",
             extra={"operation": "search_memory", "user_id": user_id},
         )
         return []
     try:
-        async with log_api_call(
-            operation="search_memory",
-            user_id=user_id,
-            api_endpoint="/v1/long-term-memory/search",
-        ) as ctx:
-            async with httpx.AsyncClient(
-                base_url=_get_base_url(),
-                timeout=_get_timeout(),
-            ) as client:
-                # Per docs: POST /v1/long-term-memory/search
-                response = await client.post(
-                    "/v1/long-term-memory/search",
-                    json={
-                        "text": query,
-                        "user_id": {"eq": user_id},
-                        "limit": 10,
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                # Per docs: response has "memories" array with text, dist, etc.
-                memories = data.get("memories", [])
-                results = [
-                    {
-                        "id": m.get("id"),
-                        "content": m.get("text"),
-                        "score": 1 - m.get("dist", 0),  # Convert distance to similarity
-                        "topics": m.get("topics", []),
-                        "created_at": m.get("created_at"),
-                    }
-                    for m in memories
-                ]
-
-                ctx["result_count"] = len(results)
-                return results
-    except (httpx.HTTPError, httpx.TimeoutException, Exception) as e:
-        logger.error(f"Memory search error: {type(e).__name__}: {e}")
+        async with _log_search(user_id=user_id) as ctx:
+            client = await get_client()
+            # Per docs: POST /v1/long-term-memory/search
+            response = await client.post(
+                _SEARCH_PATH,
+                content=_json_body({
+                    "text": query,
+                    "user_id": {"eq": user_id},
+                    "limit": 10,
+                }),
+                headers=_JSON_HEADERS,
+            )
+            response.raise_for_status()
+            data = _json_response(response)
+
+            # Per docs: response has "memories" array with text, dist, etc.
+            memories = data.get("memories", [])
+            results = [
+                {
+                    "id": m.get("id"),
+                    "content": m.get("text"),
+                    "score": 1 - m.get("dist", 0),  # Convert distance to similarity
+                    "topics": m.get("topics", []),
+                    "created_at": m.get("created_at"),
+                }
+                for m in memories
+            ]
+
+            ctx["result_count"] = len(results)
+            return results
+    except Exception as e:
+        logger.error("Memory search error: %s: %s", type(e).__name__, e)
         return []
 
 
@@ -129,50 +281,153 @@ async def add_memory(
     Returns:
         Created memory object, or empty dict on failure
     """
-    if not is_memory_enabled():
+    if not _MEMORY_ENABLED:
         logger.debug(
             "Memory feature disabled, skipping add",
             extra={"operation": "add_memory", "user_id": user_id},
         )
         return {}
 
+    # Per docs: POST /v1/long-term-memory/ with memories array
+    # id field is required per Redis agent-memory-server API
+    memory = {
+        "id": f"{_MEMORY_ID_PREFIX}{next(_memory_id_counter):08x}",
+        "text": text,
+        "memory_type": "semantic",
+        "user_id": user_id,
+        "topics": [app],
+    }
+    # Writes are coalesced with concurrent adds into a single POST
+    return await _writer.submit(memory)
+
+
+async def _post_memories(memories: list[dict[str, Any]]) -> dict[str, Any]:
+    """POST a batch of one user's memories in one request.
+
+    Returns:
+        Server response, or empty dict on failure
+    """
     try:
-        async with log_api_call(
-            operation="add_memory",
-            user_id=user_id,
-            api_endpoint="/v1/long-term-memory/",
-        ) as ctx:
-            async with httpx.AsyncClient(
-                base_url=_get_base_url(),
-                timeout=_get_timeout(),
-            ) as client:
-                # Per docs: POST /v1/long-term-memory/ with memories array
-                # id field is required per Redis agent-memory-server API
-                memory_id = f"jarvis-{uuid.uuid4().hex[:12]}"
-                response = await client.post(
-                    "/v1/long-term-memory/",
-                    json={
-                        "memories": [
-                            {
-                                "id": memory_id,
-                                "text": text,
-                                "memory_type": "semantic",
-                                "user_id": user_id,
-                                "topics": [app],
-                            }
-                        ]
-                    },
-                )
-                response.raise_for_status()
-                result = response.json()
-                logger.info(f"Memory added successfully: {result}")
-                ctx["success"] = True
-                return result if result else {}
-    except (httpx.HTTPError, httpx.TimeoutException, Exception) as e:
-        logger.error(f"Memory add error: {type(e).__name__}: {e}")
+        async with _log_add(user_id=memories[0]["user_id"]) as ctx:
+            client = await get_client()
+            response = await client.post(
+                _CREATE_PATH,
+                content=_json_body({"memories": memories}),
+                headers=_JSON_HEADERS,
+            )
+            response.raise_for_status()
+            result = _json_response(response)
+            logger.info("Memory added successfully: %s", result)
+            ctx["result_count"] = len(memories)
+            return result if result else {}
+    except Exception as e:
+        logger.error("Memory add error: %s: %s", type(e).__name__, e)
         return {}
 
 
+class MemoryWriter:
+    """
+    Coalesces add_memory writes into batched POSTs.
+
+    Entries submitted within MEMORY_BATCH_WINDOW_SECONDS of each other (up to
+    MEMORY_BATCH_MAX) are sent as one request per user, so a user the server
+    rejects can't fail another user's writes. Each caller receives its own
+    copy of its user's result.
+    """
+
+    def __init__(self) -> None:
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def submit(self, memory: dict[str, Any]) -> asyncio.Future:
+        """Queue a memory for the next batch.
+
+        Returns:
+            Future resolved with the server response for this memory's user
+            ({} on failure)
+        """
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            # A task left on a previous (possibly closed) loop never completes
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._task = None
+        future = loop.create_future()
+        self._queue.put_nowait((memory, future))
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._flush_loop(self._queue))
+        return future
+
+    async def close(self) -> None:
+        """Stop the flush loop, failing any still-queued writes with {}."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_result({})
+            self._queue = None
+
+    @staticmethod
+    def _drain(queue: asyncio.Queue, batch: list) -> None:
+        while len(batch) < MEMORY_BATCH_MAX and not queue.empty():
+            batch.append(queue.get_nowait())
+
+    async def _flush_loop(self, queue: asyncio.Queue) -> None:
+        # Runs only while writes are pending; submit() restarts it when idle
+        while not queue.empty():
+            batch = [queue.get_nowait()]
+            # Stays empty if cancelled mid-batch, so callers never hang
+            results: dict[str, dict[str, Any]] = {}
+            try:
+                self._drain(queue, batch)
+                if len(batch) < MEMORY_BATCH_MAX:
+                    await asyncio.sleep(MEMORY_BATCH_WINDOW_SECONDS)
+                    self._drain(queue, batch)
+                by_user: dict[str, list[dict[str, Any]]] = {}
+                for memory, _ in batch:
+                    by_user.setdefault(memory["user_id"], []).append(memory)
+                posted = await asyncio.gather(
+                    *(_post_memories(memories) for memories in by_user.values())
+                )
+                results = dict(zip(by_user, posted))
+            finally:
+                for memory, future in batch:
+                    if not future.done():
+                        # Copied so callers can't see each other's mutations
+                        future.set_result(dict(results.get(memory["user_id"], {})))
+
+
+_writer = MemoryWriter()
+
+
+def add_memory_bg(
+    text: str, user_id: str, app: str = "jarvis-voice"
+) -> asyncio.Task:
+    """
+    Schedule add_memory in the background without waiting for the round trip.
+
+    Args:
+        text: The fact to remember about the user
+        user_id: User identifier
+        app: Application name for memory tagging
+
+    Returns:
+        The task running add_memory; its result is the created memory object
+    """
+    task = asyncio.create_task(add_memory(text, user_id, app))
+    _bg_tasks.add(task)
+    task.add_done_callback(_bg_tasks.discard)
+    return task
+
+
 async def get_memories(user_id: str, limit: int = 10) -> list[dict[str, Any]]:
     """
     Get all memories for a user.
@@ -186,49 +441,43 @@ async def get_memories(user_id: str, limit: int = 10) -> list[dict[str, Any]]:
     Returns:
         List of memory objects
     """
-    if not is_memory_enabled():
+    if not _MEMORY_ENABLED:
         logger.debug(
             "Memory feature disabled, skipping get_memories",
             extra={"operation": "get_memories", "user_id": user_id},
         )
         return []
     try:
-        async with log_api_call(
-            operation="get_memories",
-            user_id=user_id,
-            api_endpoint="/v1/long-term-memory/search",
-        ) as ctx:
-            async with httpx.AsyncClient(
-                base_url=_get_base_url(),
-                timeout=_get_timeout(),
-            ) as client:
-                # Search with empty text to get all memories for user
-                response = await client.post(
-                    "/v1/long-term-memory/search",
-                    json={
-                        "text": "",
-                        "user_id": {"eq": user_id},
-                        "limit": limit,
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                memories = data.get("memories", [])
-                results = [
-                    {
-                        "id": m.get("id"),
-                        "content": m.get("text"),
-                        "topics": m.get("topics", []),
-                        "created_at": m.get("created_at"),
-                    }
-                    for m in memories
-                ]
-
-                ctx["result_count"] = len(results)
-                return results
-    except (httpx.HTTPError, httpx.TimeoutException, Exception) as e:
-        logger.error(f"Get memories error: {type(e).__name__}: {e}")
+        async with _log_get(user_id=user_id) as ctx:
+            client = await get_client()
+            # Search with empty text to get all memories for user
+            response = await client.post(
+                _SEARCH_PATH,
+                content=_json_body({
+                    "text": "",
+                    "user_id": {"eq": user_id},
+                    "limit": limit,
+                }),
+                headers=_JSON_HEADERS,
+            )
+            response.raise_for_status()
+            data = _json_response(response)
+
+            memories = data.get("memories", [])
+            results = [
+                {
+                    "id": m.get("id"),
+                    "content": m.get("text"),
+                    "topics": m.get("topics", []),
+                    "created_at": m.get("created_at"),
+                }
+                for m in memories
+            ]
+
+            ctx["result_count"] = len(results)
+            return results
+    except Exception as e:
+        logger.error("Get memories error: %s: %s", type(e).__name__, e)
         return []
 
 
@@ -245,24 +494,18 @@ async def delete_user_memories(user_id: str) -> bool:
         True if successful, False on failure
     """
     try:
-        async with log_api_call(
-            operation="delete_user_memories",
-            user_id=user_id,
-            api_endpoint="/v1/long-term-memory/forget",
-        ):
-            async with httpx.AsyncClient(
-                base_url=_get_base_url(),
-                timeout=_get_timeout(),
-            ) as client:
-                response = await client.post(
-                    "/v1/long-term-memory/forget",
-                    json={
-                        "user_id": user_id,
-                        "dry_run": False,
-                    },
-                )
-                response.raise_for_status()
-                return True
-    except (httpx.HTTPError, httpx.TimeoutException, Exception) as e:
-        logger.error(f"Delete memories error: {type(e).__name__}: {e}")
+        async with _log_delete(user_id=user_id):
+            client = await get_client()
+            response = await client.post(
+                _FORGET_PATH,
+                content=_json_body({
+                    "user_id": user_id,
+                    "dry_run": False,
+                }),
+                headers=_JSON_HEADERS,
+            )
+            response.raise_for_status()
+            return True
+    except Exception as e:
+        logger.error("Delete memories error: %s: %s", type(e).__name__, e)
         return False
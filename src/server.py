@@ -9,8 +9,10 @@ Provides:
 
 import os
 import asyncio
+import json
 import logging
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import Optional, Union
 from urllib.parse import parse_qs
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
@@ -18,15 +20,21 @@ from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to stdlib json
+    orjson = None
+
+# Load environment variables before importing modules that read config at import
+load_dotenv()
+
+from src.memory_client import close_client, get_client
 from src.voice_live import VoiceLiveSession
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
-
 # Configure Azure Monitor / OpenTelemetry if connection string is available
 APPINSIGHTS_CONNECTION_STRING = os.getenv("APPLICATIONINSIGHTS_CONNECTION_STRING")
 if APPINSIGHTS_CONNECTION_STRING:
@@ -47,7 +55,15 @@ else:
     logger.info("APPLICATIONINSIGHTS_CONNECTION_STRING not set, telemetry disabled")
     tracer = None
 
-app = FastAPI(title="Jarvis Voice API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared memory HTTP client on startup and close it on shutdown."""
+    await get_client()
+    yield
+    await close_client()
+
+
+app = FastAPI(title="Jarvis Voice API", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -69,6 +85,52 @@ VOICE_LIVE_INSTRUCTIONS = os.getenv(
 )
 
 
+# Pre-serialized frames for messages that never change
+_CONNECTED_FRAME = '{"type":"connected"}'
+_CLEAR_AUDIO_FRAME = '{"type":"clear_audio"}'
+_AUDIO_FRAME_PREFIX = '{"type":"audio","data":"'
+_AUDIO_FRAME_SUFFIX = '"}'
+
+
+def _dumps(payload: dict) -> str:
+    """Serialize a WebSocket message payload to a JSON text frame."""
+    if orjson is not None:
+        return orjson.dumps(payload).decode("utf-8")
+    return json.dumps(payload)
+
+
+def _loads(raw: Union[str, bytes]) -> dict:
+    """Parse a JSON WebSocket frame."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+async def _receive_message(websocket: WebSocket) -> dict:
+    """Receive and parse one client message.
+
+    Binary frames carry raw PCM16 audio and are returned as
+    {"type": "audio", "pcm": <bytes>}; text frames are JSON messages.
+
+    Raises:
+        WebSocketDisconnect: If the client disconnected
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+
+    raw = message.get("text")
+    if raw is None:
+        return {"type": "audio", "pcm": message.get("bytes")}
+    # Audio frames dominate traffic; plain base64 payloads need no JSON parsing.
+    # Anything with quotes or escapes (extra keys, "\/") goes to the real parser.
+    if raw.startswith(_AUDIO_FRAME_PREFIX) and raw.endswith(_AUDIO_FRAME_SUFFIX):
+        data = raw[len(_AUDIO_FRAME_PREFIX):-len(_AUDIO_FRAME_SUFFIX)]
+        if '"' not in data and "\\" not in data:
+            return {"type": "audio", "data": data}
+    return _loads(raw)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -84,26 +146,26 @@ async def websocket_voice(websocket: WebSocket):
     query_string = websocket.scope.get("query_string", b"").decode()
     params = parse_qs(query_string)
     user_id = params.get("user_id", ["anonymous_user"])[0]
-    logger.info(f"WebSocket connected: user_id={user_id}")
+    logger.info("WebSocket connected: user_id=%s", user_id)
 
     # Send connected message
-    await websocket.send_json({"type": "connected"})
+    await websocket.send_text(_CONNECTED_FRAME)
 
     # Check if Voice Live credentials are configured
     if not VOICE_LIVE_ENDPOINT or not VOICE_LIVE_API_KEY:
-        await websocket.send_json({
+        await websocket.send_text(_dumps({
             "type": "error",
             "message": "Voice Live API not configured. Set AZURE_VOICE_LIVE_ENDPOINT and AZURE_VOICE_LIVE_API_KEY."
-        })
+        }))
         # Continue without Voice Live for testing
         try:
             while True:
-                data = await websocket.receive_json()
+                data = await _receive_message(websocket)
                 msg_type = data.get("type")
 
                 if msg_type == "mute":
                     muted = data.get("muted", False)
-                    await websocket.send_json({"type": "mute_status", "muted": muted})
+                    await websocket.send_text(_dumps({"type": "mute_status", "muted": muted}))
 
         except WebSocketDisconnect:
             pass
@@ -122,38 +184,43 @@ async def websocket_voice(websocket: WebSocket):
     # Set up callbacks to forward events to WebSocket client
     async def on_audio(audio_base64: str):
         """Forward audio from Voice Live to client."""
+        if not audio_base64:
+            return
         try:
-            logger.info(f"AUDIO: Received {len(audio_base64) if audio_base64 else 0} bytes")
-            await websocket.send_json({"type": "audio", "data": audio_base64})
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("AUDIO bytes=%d", len(audio_base64))
+            # Base64 is JSON-safe, so the frame is assembled without the encoder
+            await websocket.send_text(_AUDIO_FRAME_PREFIX + audio_base64 + _AUDIO_FRAME_SUFFIX)
         except Exception as e:
-            logger.error(f"AUDIO ERROR: {e}")
+            # Keep the session's event loop alive if the client send fails
+            logger.error("AUDIO ERROR: %s", e)
 
     async def on_transcript(text: str):
         """Forward transcript from Voice Live to client."""
         try:
-            logger.info(f"TRANSCRIPT: {text}")
-            await websocket.send_json({"type": "transcript", "text": text})
+            logger.info("TRANSCRIPT: %s", text)
+            await websocket.send_text(_dumps({"type": "transcript", "text": text}))
         except Exception as e:
-            logger.error(f"TRANSCRIPT ERROR: {e}")
+            logger.error("TRANSCRIPT ERROR: %s", e)
 
     async def on_speech_started():
         """User started speaking - send barge-in signal."""
         try:
-            await websocket.send_json({"type": "clear_audio"})
+            await websocket.send_text(_CLEAR_AUDIO_FRAME)
         except Exception:
             pass
 
     async def on_status(status: str):
         """Forward status updates to client."""
         try:
-            await websocket.send_json({"type": "status", "state": status})
+            await websocket.send_text(_dumps({"type": "status", "state": status}))
         except Exception:
             pass
 
     async def on_error(error: str):
         """Forward errors to client."""
         try:
-            await websocket.send_json({"type": "error", "message": error})
+            await websocket.send_text(_dumps({"type": "error", "message": error}))
         except Exception:
             pass
 
@@ -168,34 +235,42 @@ async def websocket_voice(websocket: WebSocket):
 
     try:
         # Connect to Voice Live
-        logger.info(f"Connecting to Voice Live: {VOICE_LIVE_ENDPOINT}")
+        logger.info("Connecting to Voice Live: %s", VOICE_LIVE_ENDPOINT)
         await session.connect()
         logger.info("Voice Live connected successfully")
 
         while True:
             # Receive message from client
-            data = await websocket.receive_json()
+            data = await _receive_message(websocket)
 
             msg_type = data.get("type")
 
             if msg_type == "audio":
                 # Forward audio to Voice Live (only if not muted)
-                audio_data = data.get("data", "")
-                logger.info(f"Received audio from browser: {len(audio_data) if audio_data else 0} bytes, muted={muted}")
+                pcm = data.get("pcm")
+                audio_data = pcm if pcm is not None else data.get("data", "")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "Received audio from browser: %d bytes, muted=%s",
+                        len(audio_data) if audio_data else 0,
+                        muted,
+                    )
                 if not muted:
-                    if audio_data:
+                    if pcm:
+                        await session.send_audio_bytes(pcm)
+                    elif audio_data:
                         await session.send_audio(audio_data)
 
             elif msg_type == "mute":
                 # Handle mute toggle
                 muted = data.get("muted", False)
-                await websocket.send_json({"type": "mute_status", "muted": muted})
+                await websocket.send_text(_dumps({"type": "mute_status", "muted": muted}))
 
     except WebSocketDisconnect:
         pass
     except Exception as e:
         try:
-            await websocket.send_json({"type": "error", "message": str(e)})
+            await websocket.send_text(_dumps({"type": "error", "message": str(e)}))
         except Exception:
             pass
     finally:
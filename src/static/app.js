@@ -56,21 +56,16 @@ function calculateRMS(samples) {
 }
 
 /**
- * Convert Float32 samples to PCM16 base64
+ * Convert Float32 samples to raw PCM16 (little-endian) bytes
  */
-function floatToPCM16Base64(samples) {
+function floatToPCM16(samples) {
   const buffer = new ArrayBuffer(samples.length * 2);
   const view = new DataView(buffer);
   for (let i = 0; i < samples.length; i++) {
     const s = Math.max(-1, Math.min(1, samples[i]));
     view.setInt16(i * 2, s < 0 ? s * 0x8000 : s * 0x7fff, true);
   }
-  const bytes = new Uint8Array(buffer);
-  let binary = '';
-  for (let i = 0; i < bytes.length; i++) {
-    binary += String.fromCharCode(bytes[i]);
-  }
-  return btoa(binary);
+  return buffer;
 }
 
 /**
@@ -461,8 +456,8 @@ async function startMicrophone() {
 
       // Send to server if connected and not muted
       if (ws && ws.readyState === WebSocket.OPEN && !muted) {
-        const base64 = floatToPCM16Base64(samples);
-        ws.send(JSON.stringify({ type: 'audio', data: base64 }));
+        // Raw PCM as a binary frame: no base64 or JSON envelope
+        ws.send(floatToPCM16(samples));
       }
     };
 
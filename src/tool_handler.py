@@ -1,15 +1,53 @@
 """Tool call handler for routing Voice Live function calls to memory operations."""
 
+import asyncio
+import hashlib
 import logging
 import os
 import time
-from typing import Any
+from collections.abc import Awaitable, Callable
+from typing import Any, Union
 
-from src.memory_client import add_memory, search_memory
+from src.memory_client import add_memory_bg, search_memory
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Default lifetime of cached search_memory results, in seconds
+DEFAULT_SEARCH_CACHE_TTL_SECONDS = 300.0
+
+# Maximum number of cached (user_id, query) entries
+SEARCH_CACHE_MAX_ENTRIES = 512
+
+
+def _parse_search_cache_ttl() -> float:
+    """Get the search cache TTL from environment or use default (0 disables)."""
+    ttl_str = os.getenv("MEMORY_SEARCH_CACHE_TTL")
+    if ttl_str:
+        try:
+            return max(float(ttl_str), 0.0)
+        except ValueError:
+            pass
+    return DEFAULT_SEARCH_CACHE_TTL_SECONDS
+
+
+_SEARCH_CACHE_TTL = _parse_search_cache_ttl()
+
+# (user_id, normalized query) -> (monotonic time stored, results)
+_SEARCH_CACHE: dict[tuple[str, str], tuple[float, list[dict[str, Any]]]] = {}
+
+# In-flight searches, so concurrent identical queries share one request
+_SEARCH_INFLIGHT: dict[tuple[str, str], asyncio.Task] = {}
+
+# How long a stored fact suppresses identical add_memory calls, in seconds
+ADD_DEDUP_WINDOW_SECONDS = 30.0
+
+# (user_id, text digest) -> in-flight background write
+_ADD_INFLIGHT: dict[tuple[str, bytes], asyncio.Task] = {}
+
+# (user_id, text digest) -> monotonic time the write completed
+_ADD_RECENT: dict[tuple[str, bytes], float] = {}
+
 # OpenTelemetry tracing (optional)
 tracer = None
 try:
@@ -20,16 +58,68 @@ except ImportError:
     pass
 
 
-def _record_memory_event(operation: str, user_id: str, latency_ms: float, success: bool, **extra):
+class _StringArgs:
+    """Validator for tool arguments that are all required non-empty strings.
+
+    Error messages are built once per tool rather than on every call.
+
+    Args:
+        tool: Tool name, used in log messages
+        *names: Required argument names, in the order parse() returns them
+    """
+
+    __slots__ = ("tool", "names", "_missing_error", "_type_error")
+
+    def __init__(self, tool: str, *names: str) -> None:
+        self.tool = tool
+        self.names = names
+        joined = " and ".join(names)
+        self._missing_error = f"Missing required arguments: {joined}"
+        self._type_error = f"Arguments {joined} must be strings"
+
+    def parse(self, arguments: dict[str, Any]) -> Union[tuple[str, ...], dict[str, Any]]:
+        """Extract the arguments, or return an error response if invalid."""
+        values = tuple(arguments.get(name) for name in self.names)
+
+        if not all(values):
+            logger.warning("Missing required arguments for %s: %s", self.tool, arguments)
+            return {"success": False, "error": self._missing_error}
+
+        if not all(isinstance(value, str) for value in values):
+            logger.warning("Invalid argument types for %s: %s", self.tool, arguments)
+            return {"success": False, "error": self._type_error}
+
+        return values
+
+
+_SEARCH_ARGS = _StringArgs("search_memory", "query", "user_id")
+_ADD_ARGS = _StringArgs("add_memory", "text", "user_id")
+
+
+def _record_memory_event_traced(
+    operation: str, user_id: str, latency_ms: float, success: bool, **extra
+) -> None:
     """Record custom telemetry event for memory operations."""
-    if tracer:
-        with tracer.start_as_current_span(f"memory.{operation}") as span:
-            span.set_attribute("memory.operation", operation)
-            span.set_attribute("memory.user_id", user_id)
-            span.set_attribute("memory.latency_ms", latency_ms)
-            span.set_attribute("memory.success", success)
-            for key, value in extra.items():
-                span.set_attribute(f"memory.{key}", value)
+    with tracer.start_as_current_span(f"memory.{operation}") as span:
+        attributes = {
+            "memory.operation": operation,
+            "memory.user_id": user_id,
+            "memory.latency_ms": latency_ms,
+            "memory.success": success,
+        }
+        for key, value in extra.items():
+            attributes[f"memory.{key}"] = value
+        span.set_attributes(attributes)
+
+
+def _record_memory_event_noop(
+    operation: str, user_id: str, latency_ms: float, success: bool, **extra
+) -> None:
+    """Discard telemetry when tracing is not configured."""
+
+
+# Chosen once at import so handlers never re-check whether tracing is on
+_record_memory_event = _record_memory_event_traced if tracer else _record_memory_event_noop
 
 
 async def handle_tool_call(name: str, arguments: dict[str, Any]) -> dict[str, Any]:
@@ -45,41 +135,61 @@ async def handle_tool_call(name: str, arguments: dict[str, Any]) -> dict[str, An
     """
     logger.info("Tool call received: %s with arguments: %s", name, arguments)
 
-    if name == "search_memory":
-        return await _handle_search_memory(arguments)
-    elif name == "add_memory":
-        return await _handle_add_memory(arguments)
-    else:
-        logger.warning("Unknown tool name: %s", name)
-        return {
-            "success": False,
-            "error": f"Unknown tool: {name}",
-        }
+    handler = _DISPATCH.get(name)
+    if handler is None:
+        return unknown_tool_result(name)
+    return await handler(arguments)
 
 
-async def _handle_search_memory(arguments: dict[str, Any]) -> dict[str, Any]:
-    """Handle search_memory tool calls."""
-    query = arguments.get("query")
-    user_id = arguments.get("user_id")
+async def handle_tool_calls(calls: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Handle several function calls concurrently.
 
-    if not query or not user_id:
-        logger.warning("Missing required arguments for search_memory: %s", arguments)
-        return {
-            "success": False,
-            "error": "Missing required arguments: query and user_id",
-        }
+    The memory server has no batch search endpoint, so the calls are
+    gathered; identical searches still share one request via the cache.
+
+    Args:
+        calls: Tool calls, each a dict with "name" and "arguments" keys
+
+    Returns:
+        Structured responses, in the same order as calls
+    """
+    return list(
+        await asyncio.gather(
+            *(handle_tool_call(call.get("name", ""), call.get("arguments") or {}) for call in calls)
+        )
+    )
+
+
+def is_known_tool(name: str) -> bool:
+    """Check whether a tool name has a handler, without starting a coroutine."""
+    return name in _DISPATCH
 
-    if not isinstance(query, str) or not isinstance(user_id, str):
-        logger.warning("Invalid argument types for search_memory: %s", arguments)
-        return {
-            "success": False,
-            "error": "Arguments query and user_id must be strings",
-        }
+
+def unknown_tool_result(name: str) -> dict[str, Any]:
+    """Build the error response for a call to an unknown tool.
+
+    Synchronous so callers can reject unknown tools without awaiting
+    handle_tool_call.
+    """
+    logger.warning("Unknown tool name: %s", name)
+    return {
+        "success": False,
+        "error": f"Unknown tool: {name}",
+    }
+
+
+async def _handle_search_memory(arguments: dict[str, Any]) -> dict[str, Any]:
+    """Handle search_memory tool calls."""
+    args = _SEARCH_ARGS.parse(arguments)
+    if isinstance(args, dict):
+        return args
+    query, user_id = args
 
     logger.info("Searching memory for user %s with query: %s", user_id, query)
-    start_time = time.time()
-    results = await search_memory(query, user_id)
-    latency_ms = (time.time() - start_time) * 1000
+    start_time = time.perf_counter()
+    results = await _cached_search(query, user_id)
+    latency_ms = (time.perf_counter() - start_time) * 1000
     logger.info("Search returned %d results in %.2fms", len(results), latency_ms)
 
     # Record telemetry
@@ -92,46 +202,128 @@ async def _handle_search_memory(arguments: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-async def _handle_add_memory(arguments: dict[str, Any]) -> dict[str, Any]:
-    """Handle add_memory tool calls."""
-    text = arguments.get("text")
-    user_id = arguments.get("user_id")
+async def _cached_search(query: str, user_id: str) -> list[dict[str, Any]]:
+    """Search memory through a short-lived per-user cache.
 
-    if not text or not user_id:
-        logger.warning("Missing required arguments for add_memory: %s", arguments)
-        return {
-            "success": False,
-            "error": "Missing required arguments: text and user_id",
-        }
+    Repeated queries within the TTL are served from the cache and concurrent
+    identical queries share a single request. The request runs in its own
+    task, so cancelling one caller never cancels it for the others. Empty
+    results are not cached, since search_memory also returns [] when the API
+    call fails.
+    """
+    if _SEARCH_CACHE_TTL <= 0:
+        return await search_memory(query, user_id)
 
-    if not isinstance(text, str) or not isinstance(user_id, str):
-        logger.warning("Invalid argument types for add_memory: %s", arguments)
-        return {
-            "success": False,
-            "error": "Arguments text and user_id must be strings",
-        }
+    key = (user_id, query.strip().lower())
+    entry = _SEARCH_CACHE.get(key)
+    if entry is not None:
+        if time.monotonic() - entry[0] < _SEARCH_CACHE_TTL:
+            return entry[1]
+        del _SEARCH_CACHE[key]
 
-    logger.info("Adding memory for user %s: %s", user_id, text[:50])
-    start_time = time.time()
-    result = await add_memory(text, user_id)
-    latency_ms = (time.time() - start_time) * 1000
+    task = _SEARCH_INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.create_task(_search_and_cache(key, query, user_id))
+        _SEARCH_INFLIGHT[key] = task
+        task.add_done_callback(lambda done: _search_done(key, done))
+    return await asyncio.shield(task)
 
-    # Record telemetry
-    _record_memory_event("add", user_id, latency_ms, True)
 
-    if result:
-        logger.info("Memory added successfully in %.2fms", latency_ms)
-        return {
-            "success": True,
-            "memory": result,
-            "message": "Memory stored successfully",
-        }
-    else:
-        # API returns null when memory is deduplicated or no new facts extracted
-        # This is expected behavior, not an error
-        logger.info("Memory processed (deduplicated or no new facts) in %.2fms", latency_ms)
+async def _search_and_cache(
+    key: tuple[str, str], query: str, user_id: str
+) -> list[dict[str, Any]]:
+    """Run one shared search and cache non-empty results."""
+    results = await search_memory(query, user_id)
+    if results:
+        _SEARCH_CACHE[key] = (time.monotonic(), results)
+        if len(_SEARCH_CACHE) > SEARCH_CACHE_MAX_ENTRIES:
+            # Dicts keep insertion order, so the first key is the oldest
+            del _SEARCH_CACHE[next(iter(_SEARCH_CACHE))]
+    return results
+
+
+def _search_done(key: tuple[str, str], task: asyncio.Task) -> None:
+    """Forget a finished shared search."""
+    if _SEARCH_INFLIGHT.get(key) is task:
+        del _SEARCH_INFLIGHT[key]
+    if not task.cancelled():
+        # Mark retrieved so a failure nobody is still awaiting isn't reported
+        task.exception()
+
+
+def _invalidate_search_cache(user_id: str) -> None:
+    """Drop cached search results for a user whose memories are changing."""
+    for key in [key for key in _SEARCH_CACHE if key[0] == user_id]:
+        del _SEARCH_CACHE[key]
+
+
+def _recently_added(key: tuple[str, bytes]) -> bool:
+    """Check whether an identical memory was stored within the dedup window."""
+    now = time.monotonic()
+    # Prune lazily, only once the table has grown past the cache size bound
+    if len(_ADD_RECENT) > SEARCH_CACHE_MAX_ENTRIES:
+        for stale in [k for k, t in _ADD_RECENT.items() if now - t >= ADD_DEDUP_WINDOW_SECONDS]:
+            del _ADD_RECENT[stale]
+    added_at = _ADD_RECENT.get(key)
+    return added_at is not None and now - added_at < ADD_DEDUP_WINDOW_SECONDS
+
+
+async def _handle_add_memory(arguments: dict[str, Any]) -> dict[str, Any]:
+    """Handle add_memory tool calls."""
+    args = _ADD_ARGS.parse(arguments)
+    if isinstance(args, dict):
+        return args
+    text, user_id = args
+
+    key = (user_id, hashlib.blake2b(text.encode(), digest_size=16).digest())
+    if key in _ADD_INFLIGHT or _recently_added(key):
+        # A repeated fact collapses into the write already made or under way
+        logger.info("Skipping duplicate memory for user %s: %s", user_id, text[:50])
         return {
             "success": True,
             "memory": None,
-            "message": "Memory already exists or no new facts to store",
+            "message": "Memory is being stored",
         }
+
+    logger.info("Adding memory for user %s: %s", user_id, text[:50])
+    start_time = time.perf_counter()
+    _invalidate_search_cache(user_id)
+
+    def _on_added(task: asyncio.Task) -> None:
+        _ADD_INFLIGHT.pop(key, None)
+        if task.cancelled():
+            return
+        result = task.result()
+        if result:
+            _ADD_RECENT[key] = time.monotonic()
+        # A search may have re-cached results while the write was in flight
+        _invalidate_search_cache(user_id)
+        latency_ms = (time.perf_counter() - start_time) * 1000
+
+        # Record telemetry
+        _record_memory_event("add", user_id, latency_ms, True)
+
+        if result:
+            logger.info("Memory added successfully in %.2fms", latency_ms)
+        else:
+            # API returns null when memory is deduplicated or no new facts extracted
+            # This is expected behavior, not an error
+            logger.info("Memory processed (deduplicated or no new facts) in %.2fms", latency_ms)
+
+    # Store in the background so the voice reply isn't blocked on the write
+    task = add_memory_bg(text, user_id)
+    _ADD_INFLIGHT[key] = task
+    task.add_done_callback(_on_added)
+
+    return {
+        "success": True,
+        "memory": None,
+        "message": "Memory is being stored",
+    }
+
+
+# Tool name -> handler, consulted by handle_tool_call
+_DISPATCH: dict[str, Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]] = {
+    "search_memory": _handle_search_memory,
+    "add_memory": _handle_add_memory,
+}
@@ -6,16 +6,23 @@ managing voice sessions with callbacks for audio, transcripts, and events.
 """
 
 import asyncio
-import base64
+import binascii
+import functools
 import json
 import logging
-from typing import Optional, Callable, Any
+import re
+from typing import Optional, Callable, Any, Awaitable, Union
 
 import websockets
 from websockets.asyncio.client import connect as ws_connect
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to stdlib json
+    orjson = None
+
 from src.memory_tools import MEMORY_TOOLS
-from src.tool_handler import handle_tool_call
+from src.tool_handler import handle_tool_call, is_known_tool, unknown_tool_result
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +33,242 @@ Use search_memory before answering personal questions like "what's my favorite..
 Use add_memory when the user shares personal information, preferences, or important details.
 Be conversational, concise, and helpful."""
 
+# input_audio_buffer.append frame, split around its base64 payload
+_AUDIO_APPEND_PREFIX = '{"type":"input_audio_buffer.append","audio":"'
+_AUDIO_APPEND_SUFFIX = '"}'
+
+# Payloads matching this need no JSON escaping and go straight into the frame
+_BASE64_RE = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+
+# Sent after a function result to let the model continue speaking
+_RESPONSE_CREATE_FRAME = '{"type":"response.create"}'
+
+# Response audio chunk events (GA and preview names), routed by _route_audio
+_AUDIO_DELTA_EVENTS = ("response.audio.delta", "response.output_audio.delta")
+
+# Compact frame openings for those events, matched before any JSON parsing
+_AUDIO_DELTA_PREFIXES = tuple('{"type":"%s",' % event_type for event_type in _AUDIO_DELTA_EVENTS)
+_DELTA_KEY = '"delta":"'
+
+# Transcript deltas arriving within this window are delivered as one string
+TRANSCRIPT_FLUSH_SECONDS = 0.02
+
+# Audio deltas are delivered together after this window, or once this many
+# are pending, to cut callback and downstream frame overhead
+AUDIO_FLUSH_SECONDS = 0.02
+AUDIO_BATCH_MAX = 4
+
+# Largest inbound frame accepted; session and transcript events can exceed
+# the websockets default of 1 MiB
+WS_MAX_SIZE = 2**22
+
+
+def _dumps(payload: Any) -> str:
+    """Serialize a payload to JSON text."""
+    if orjson is not None:
+        return orjson.dumps(payload).decode("utf-8")
+    return json.dumps(payload)
+
+
+def _loads(raw: Union[str, bytes]) -> Any:
+    """Parse JSON text or bytes."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _to_openai_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Convert tool definitions to the Realtime API session format."""
+    return [
+        {
+            "type": "function",
+            "name": tool["name"],
+            "description": tool.get("description", ""),
+            "parameters": tool.get("parameters", {}),
+        }
+        for tool in tools
+        if tool.get("type") == "function"
+    ]
+
+
+# MEMORY_TOOLS is static, so every session can share one converted copy
+_DEFAULT_OPENAI_TOOLS = _to_openai_tools(MEMORY_TOOLS)
+
+
+def _as_async(callback: Optional[Callable[..., Any]]) -> Optional[Callable[..., Awaitable[Any]]]:
+    """Return an awaitable form of a callback, wrapping sync callables once."""
+    if callback is None or asyncio.iscoroutinefunction(callback):
+        return callback
+
+    async def call_sync(*args: Any) -> None:
+        callback(*args)
+
+    return call_sync
+
+
+def _scan_audio_delta(frame: Union[str, bytes]) -> Optional[str]:
+    """Extract the base64 payload of an audio delta frame without parsing it.
+
+    Base64 never contains ``"`` or ``\\``, so the payload runs from the
+    ``delta`` key to the next quote.
+
+    Returns:
+        The delta string, or None if the frame needs a full parse
+    """
+    if not isinstance(frame, str) or not frame.startswith(_AUDIO_DELTA_PREFIXES):
+        return None
+    start = frame.find(_DELTA_KEY)
+    if start < 0:
+        return None
+    start += len(_DELTA_KEY)
+    end = frame.find('"', start)
+    if end < 0:
+        return None
+    return frame[start:end]
+
+
+def _join_base64(chunks: list[str]) -> str:
+    """Join base64 audio chunks into a single base64 string.
+
+    Chunks that fill whole 4-character groups without padding concatenate
+    into valid base64, which is the normal case for fixed-size PCM deltas.
+    Only when an earlier chunk is padded are they decoded and re-encoded.
+    """
+    if len(chunks) == 1:
+        return chunks[0]
+    if all(len(chunk) % 4 == 0 and not chunk.endswith("=") for chunk in chunks[:-1]):
+        return "".join(chunks)
+    pcm = b"".join([binascii.a2b_base64(chunk) for chunk in chunks])
+    return binascii.b2a_base64(pcm, newline=False).decode("ascii")
+
+
+class _Coalescer:
+    """Buffers stream fragments and delivers them joined in a single call.
+
+    Buffered fragments are delivered ``window`` seconds after the first one
+    arrives, or as soon as ``max_items`` are pending.
+
+    Args:
+        name: Stream name used in error logs
+        window: Seconds to wait for more fragments
+        join: Combines the buffered fragments into one payload
+        deliver: Coroutine function that receives the joined payload
+        max_items: Optional number of fragments that triggers an early flush
+    """
+
+    __slots__ = ("_name", "_window", "_join", "_deliver", "_max_items", "_buf", "_timer", "_task")
+
+    def __init__(
+        self,
+        name: str,
+        window: float,
+        join: Callable[[list[Any]], Any],
+        deliver: Callable[[Any], Awaitable[None]],
+        max_items: Optional[int] = None,
+    ) -> None:
+        self._name = name
+        self._window = window
+        self._join = join
+        self._deliver = deliver
+        self._max_items = max_items
+        self._buf: list[Any] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def add(self, item: Any) -> None:
+        """Buffer a fragment, flushing if the batch is full."""
+        self._buf.append(item)
+        if self._max_items is not None and len(self._buf) >= self._max_items:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._window, self._on_timer)
+
+    async def flush(self) -> None:
+        """Deliver any buffered fragments now, after an in-progress timed flush."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        task = self._task
+        if task is not None and task is not asyncio.current_task() and not task.done():
+            # Keep delivery order when a timed flush is still running
+            await task
+        if not self._buf:
+            return
+        payload = self._join(self._buf)
+        self._buf = []
+        await self._deliver(payload)
+
+    def discard(self) -> None:
+        """Drop buffered fragments and cancel any scheduled delivery."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._buf = []
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._task = asyncio.create_task(self._flush_logged())
+
+    async def _flush_logged(self) -> None:
+        """Flush from a timer task, logging callback failures."""
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("%s callback error: %s", self._name, e)
+
+
+def _session_update_frame(instructions: str, openai_tools: list[dict[str, Any]]) -> str:
+    """Build the session.update message for the given instructions and tools."""
+    # type: "realtime" is required for the Azure GA API
+    session_config: dict[str, Any] = {
+        "type": "realtime",
+        "instructions": instructions,
+    }
+    if openai_tools:
+        session_config["tools"] = openai_tools
+        session_config["tool_choice"] = "auto"
+    return _dumps({"type": "session.update", "session": session_config})
+
+
+@functools.lru_cache(maxsize=8)
+def _default_session_update(instructions: str) -> str:
+    """session.update message for the default tools, cached per instructions."""
+    return _session_update_frame(instructions, _DEFAULT_OPENAI_TOOLS)
+
+
+class _Callback:
+    """Session callback attribute, classified as sync or async on assignment.
+
+    Reading returns the callback as assigned. The session invokes the
+    awaitable form stored under ``_cb_<name>``, so dispatch needs no
+    per-call introspection.
+
+    Args:
+        on_set: Optional name of a session method called with the new
+            callback after each assignment
+    """
+
+    def __init__(self, on_set: Optional[str] = None) -> None:
+        self._on_set = on_set
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._raw = f"_raw_{name}"
+        self._awaitable = f"_cb_{name}"
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        return getattr(obj, self._raw)
+
+    def __set__(self, obj: Any, callback: Optional[Callable[..., Any]]) -> None:
+        setattr(obj, self._raw, callback)
+        setattr(obj, self._awaitable, _as_async(callback))
+        if self._on_set is not None:
+            getattr(obj, self._on_set)(callback)
+
 
 class VoiceLiveSession:
     """
@@ -38,8 +281,54 @@ class VoiceLiveSession:
 
         async with session:
             await session.send_audio(base64_audio)
+
+    Callbacks may be sync or async. Sync callbacks run inline on the event
+    loop, between reads from the socket, so they must not block; hand
+    blocking work (audio device writes, file I/O) to a thread or queue.
     """
 
+    __slots__ = (
+        "endpoint",
+        "api_key",
+        "model",
+        "voice",
+        "instructions",
+        "user_id",
+        "tools",
+        "compression",
+        "_ws_url",
+        "_ws_headers",
+        "_ws",
+        "_event_task",
+        "_connected",
+        "_transcript",
+        "_audio",
+        "_event_handlers",
+        # Storage behind the _Callback descriptors below
+        "_raw_on_audio",
+        "_cb_on_audio",
+        "_raw_on_transcript",
+        "_cb_on_transcript",
+        "_raw_on_speech_started",
+        "_cb_on_speech_started",
+        "_raw_on_speech_stopped",
+        "_cb_on_speech_stopped",
+        "_raw_on_status",
+        "_cb_on_status",
+        "_raw_on_error",
+        "_cb_on_error",
+        "_raw_on_function_call",
+        "_cb_on_function_call",
+    )
+
+    on_audio = _Callback(on_set="_route_audio")
+    on_transcript = _Callback()
+    on_speech_started = _Callback()
+    on_speech_stopped = _Callback()
+    on_status = _Callback()
+    on_error = _Callback()
+    on_function_call = _Callback()
+
     def __init__(
         self,
         endpoint: str,
@@ -48,7 +337,8 @@ class VoiceLiveSession:
         voice: str = "alloy",
         instructions: str = VOICE_LIVE_INSTRUCTIONS,
         user_id: str = "anonymous_user",
-        tools: Optional[list[dict[str, Any]]] = None
+        tools: Optional[list[dict[str, Any]]] = None,
+        compression: Optional[str] = None
     ):
         self.endpoint = endpoint.rstrip('/')
         self.api_key = api_key
@@ -57,15 +347,43 @@ class VoiceLiveSession:
         self.instructions = instructions
         self.user_id = user_id
         self.tools = tools if tools is not None else MEMORY_TOOLS
+        # Base64 audio barely compresses, so permessage-deflate is off unless
+        # requested (e.g. compression="deflate" on a bandwidth-limited link)
+        self.compression = compression
 
         # Build WebSocket URL (GA format)
         self._ws_url = f"{self.endpoint.replace('https://', 'wss://')}/openai/v1/realtime?model={self.model}"
+        # Connect with api-key header (Azure OpenAI requirement)
+        self._ws_headers = (("api-key", self.api_key),)
 
         # Internal connection state
         self._ws = None
         self._event_task: Optional[asyncio.Task] = None
         self._connected = False
 
+        # Coalesced delivery of transcript and audio deltas
+        self._transcript = _Coalescer(
+            "Transcript", TRANSCRIPT_FLUSH_SECONDS, "".join, self._deliver_transcript
+        )
+        self._audio = _Coalescer(
+            "Audio", AUDIO_FLUSH_SECONDS, _join_base64, self._deliver_audio, AUDIO_BATCH_MAX
+        )
+
+        # Event type -> handler, built once so dispatch is a single dict lookup
+        self._event_handlers: dict[str, Callable[[dict], Awaitable[None]]] = {
+            "session.created": self._on_session_created,
+            "session.updated": self._on_session_updated,
+            "input_audio_buffer.speech_started": self._on_speech_started,
+            "input_audio_buffer.speech_stopped": self._on_speech_stopped,
+            "response.audio_transcript.delta": self._on_transcript_delta,
+            "response.output_audio_transcript.delta": self._on_transcript_delta,
+            "response.audio.done": self._on_audio_done,
+            "response.output_audio.done": self._on_audio_done,
+            "response.done": self._on_response_done,
+            "response.function_call_arguments.done": self._handle_function_call,
+            "error": self._on_error_event,
+        }
+
         # Callbacks (all optional)
         self.on_audio: Optional[Callable[[str], Any]] = None
         self.on_transcript: Optional[Callable[[str], Any]] = None
@@ -80,76 +398,72 @@ class VoiceLiveSession:
         if self._connected:
             return
 
-        # Connect with api-key header (Azure OpenAI requirement)
-        headers = [("api-key", self.api_key)]
-
-        logger.info(f"Connecting to: {self._ws_url}")
-        self._ws = await ws_connect(self._ws_url, additional_headers=headers)
+        logger.info("Connecting to: %s", self._ws_url)
+        self._ws = await ws_connect(
+            self._ws_url,
+            additional_headers=self._ws_headers,
+            compression=self.compression,
+            max_size=WS_MAX_SIZE,
+        )
         logger.info("WebSocket connected")
 
         # Wait for session.created event
         msg = await self._ws.recv()
-        data = json.loads(msg)
+        data = _loads(msg)
         if data.get("type") == "session.created":
-            logger.info(f"Session created: {data.get('session', {}).get('id', 'unknown')}")
+            logger.info("Session created: %s", data.get("session", {}).get("id", "unknown"))
         else:
-            logger.warning(f"Unexpected first message: {data.get('type')}")
+            logger.warning("Unexpected first message: %s", data.get("type"))
 
         # Configure session
         await self._configure_session()
         self._connected = True
 
         # Send ready status to client
-        if self.on_status:
-            await self._call_callback(self.on_status, "ready")
+        if self._cb_on_status is not None:
+            await self._cb_on_status("ready")
 
         # Start event processing loop
         self._event_task = asyncio.create_task(self._process_events())
 
     async def _configure_session(self) -> None:
         """Configure the Voice Live session."""
-        # Convert tools to OpenAI format
-        openai_tools = []
-        for tool in self.tools:
-            if tool.get("type") == "function":
-                openai_tools.append({
-                    "type": "function",
-                    "name": tool["name"],
-                    "description": tool.get("description", ""),
-                    "parameters": tool.get("parameters", {}),
-                })
-
-        # Build session update message (type: "realtime" required for Azure GA API)
-        session_config = {
-            "type": "realtime",
-            "instructions": self.instructions,
-        }
+        # The default tools' update frame is built once per instructions
+        # string; custom tools are converted per session
+        if self.tools is MEMORY_TOOLS:
+            openai_tools = _DEFAULT_OPENAI_TOOLS
+            update_frame = _default_session_update(self.instructions)
+        else:
+            openai_tools = _to_openai_tools(self.tools)
+            update_frame = _session_update_frame(self.instructions, openai_tools)
 
-        # Add tools if present
         if openai_tools:
-            session_config["tools"] = openai_tools
-            session_config["tool_choice"] = "auto"
-            logger.info(f"Configured {len(openai_tools)} tools: {[t['name'] for t in openai_tools]}")
-
-        update_msg = {
-            "type": "session.update",
-            "session": session_config
-        }
+            logger.info(
+                "Configured %d tools: %s", len(openai_tools), [t["name"] for t in openai_tools]
+            )
 
-        logger.info(f"Session config: {json.dumps(session_config, indent=2)}")
-        await self._ws.send(json.dumps(update_msg))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Session config: %s", update_frame)
+        await self._ws.send(update_frame)
         logger.info("Session configuration sent")
 
         # Wait for session.updated event
         msg = await self._ws.recv()
-        data = json.loads(msg)
+        data = _loads(msg)
         if data.get("type") == "session.updated":
             logger.info("Session configured successfully")
         else:
-            logger.warning(f"Unexpected response to session.update: {data.get('type')} - {json.dumps(data.get('error', {}))}")
+            logger.warning(
+                "Unexpected response to session.update: %s - %s",
+                data.get("type"),
+                data.get("error", {}),
+            )
 
     async def disconnect(self) -> None:
         """Close the Voice Live connection."""
+        self._transcript.discard()
+        self._audio.discard()
+
         if self._event_task:
             self._event_task.cancel()
             try:
@@ -164,79 +478,153 @@ class VoiceLiveSession:
 
         self._connected = False
 
-    async def send_audio(self, audio_base64: str) -> None:
-        """Send audio data to Voice Live API."""
+    async def send_audio(self, audio_base64: Union[str, bytes]) -> None:
+        """Send audio data to Voice Live API.
+
+        Args:
+            audio_base64: Base64-encoded audio, or raw PCM16 bytes which are
+                encoded once via send_audio_bytes()
+        """
+        if isinstance(audio_base64, (bytes, bytearray, memoryview)):
+            await self.send_audio_bytes(audio_base64)
+            return
         if not self._ws:
             raise RuntimeError("Not connected. Call connect() first.")
 
-        msg = {
-            "type": "input_audio_buffer.append",
-            "audio": audio_base64
-        }
-        await self._ws.send(json.dumps(msg))
-        logger.info(f"Sent audio chunk: {len(audio_base64)} bytes")
+        if _BASE64_RE.fullmatch(audio_base64):
+            await self._ws.send(_AUDIO_APPEND_PREFIX + audio_base64 + _AUDIO_APPEND_SUFFIX)
+        else:
+            # Not plain base64; let the encoder escape it rather than trust it
+            msg = {
+                "type": "input_audio_buffer.append",
+                "audio": audio_base64
+            }
+            await self._ws.send(_dumps(msg))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sent audio chunk: %d bytes", len(audio_base64))
+
+    async def send_audio_bytes(self, pcm: bytes) -> None:
+        """Send raw PCM16 audio to Voice Live API, base64-encoding it once here."""
+        if not self._ws:
+            raise RuntimeError("Not connected. Call connect() first.")
+
+        # Base64 output never needs JSON escaping, so frame it directly
+        audio_base64 = binascii.b2a_base64(pcm, newline=False).decode("ascii")
+        await self._ws.send(_AUDIO_APPEND_PREFIX + audio_base64 + _AUDIO_APPEND_SUFFIX)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sent audio chunk: %d bytes", len(audio_base64))
 
     async def _process_events(self) -> None:
         """Process events from Voice Live connection."""
+        # Bind per-event lookups to locals once for the life of the loop
+        handle_event = self._handle_event
+        loads = _loads
+        scan_audio_delta = _scan_audio_delta
+        audio = self._audio
         try:
             async for msg in self._ws:
-                data = json.loads(msg)
-                await self._handle_event(data)
+                # Audio deltas dominate the stream; take their payload directly
+                delta = scan_audio_delta(msg)
+                if delta is not None:
+                    if delta and self._raw_on_audio is not None:
+                        await audio.add(delta)
+                    continue
+                await handle_event(loads(msg))
         except asyncio.CancelledError:
             raise
         except websockets.exceptions.ConnectionClosed:
             logger.info("WebSocket connection closed")
         except Exception as e:
-            logger.error(f"Event processing error: {e}")
-            if self.on_error:
-                await self._call_callback(self.on_error, str(e))
+            logger.error("Event processing error: %s", e)
+            if self._cb_on_error is not None:
+                await self._cb_on_error(str(e))
 
     async def _handle_event(self, event: dict) -> None:
         """Handle individual Voice Live events."""
         event_type = event.get("type", "unknown")
-        logger.info(f"Voice Live event: {event_type}")
-
-        if event_type == "session.created":
-            logger.info(f"Session created: {event.get('session', {}).get('id', 'unknown')}")
-
-        elif event_type == "session.updated":
-            if self.on_status:
-                await self._call_callback(self.on_status, "ready")
-
-        elif event_type == "input_audio_buffer.speech_started":
-            if self.on_speech_started:
-                await self._call_callback(self.on_speech_started)
-            if self.on_status:
-                await self._call_callback(self.on_status, "listening")
-
-        elif event_type == "input_audio_buffer.speech_stopped":
-            if self.on_speech_stopped:
-                await self._call_callback(self.on_speech_stopped)
-            if self.on_status:
-                await self._call_callback(self.on_status, "processing")
-
-        elif event_type == "response.audio.delta" or event_type == "response.output_audio.delta":
-            if self.on_audio:
-                # event["delta"] is base64 encoded audio
-                await self._call_callback(self.on_audio, event.get("delta", ""))
-
-        elif event_type == "response.audio_transcript.delta" or event_type == "response.output_audio_transcript.delta":
-            if self.on_transcript:
-                await self._call_callback(self.on_transcript, event.get("delta", ""))
-
-        elif event_type == "response.done":
-            if self.on_status:
-                await self._call_callback(self.on_status, "ready")
-
-        elif event_type == "response.function_call_arguments.done":
-            # Handle function call
-            await self._handle_function_call(event)
-
-        elif event_type == "error":
-            error_msg = event.get("error", {}).get("message", str(event))
-            logger.error(f"Voice Live error: {error_msg}")
-            if self.on_error:
-                await self._call_callback(self.on_error, error_msg)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Voice Live event: %s", event_type)
+
+        handler = self._event_handlers.get(event_type)
+        if handler is not None:
+            await handler(event)
+
+    async def _on_session_created(self, event: dict) -> None:
+        """Log the id of a newly created session."""
+        logger.info("Session created: %s", event.get("session", {}).get("id", "unknown"))
+
+    async def _on_session_updated(self, event: dict) -> None:
+        """Report readiness once the session config is applied."""
+        if self._cb_on_status is not None:
+            await self._cb_on_status("ready")
+
+    async def _on_speech_started(self, event: dict) -> None:
+        """Handle the user starting to speak."""
+        # Barge-in: the client drops queued playback, so drop ours too
+        self._audio.discard()
+        if self._cb_on_speech_started is not None:
+            await self._cb_on_speech_started()
+        if self._cb_on_status is not None:
+            await self._cb_on_status("listening")
+
+    async def _on_speech_stopped(self, event: dict) -> None:
+        """Handle the user finishing speaking."""
+        if self._cb_on_speech_stopped is not None:
+            await self._cb_on_speech_stopped()
+        if self._cb_on_status is not None:
+            await self._cb_on_status("processing")
+
+    def _route_audio(self, callback: Optional[Callable[[str], Any]]) -> None:
+        """Route audio delta events to the batcher, or drop them when unset."""
+        if callback is None:
+            self._audio.discard()
+            for event_type in _AUDIO_DELTA_EVENTS:
+                self._event_handlers.pop(event_type, None)
+            return
+        for event_type in _AUDIO_DELTA_EVENTS:
+            self._event_handlers[event_type] = self._on_audio_delta
+
+    async def _on_audio_delta(self, event: dict) -> None:
+        """Buffer a chunk of response audio for batched delivery."""
+        # event["delta"] is base64 encoded audio; empty ones mark segment edges
+        delta = event.get("delta")
+        if delta:
+            await self._audio.add(delta)
+
+    async def _deliver_audio(self, audio_base64: str) -> None:
+        """Pass batched audio to on_audio."""
+        if self._cb_on_audio is not None:
+            await self._cb_on_audio(audio_base64)
+
+    async def _on_transcript_delta(self, event: dict) -> None:
+        """Buffer a fragment of the response transcript for coalesced delivery."""
+        delta = event.get("delta")
+        if delta and self._cb_on_transcript is not None:
+            await self._transcript.add(delta)
+
+    async def _deliver_transcript(self, text: str) -> None:
+        """Pass coalesced transcript text to on_transcript."""
+        if self._cb_on_transcript is not None:
+            await self._cb_on_transcript(text)
+
+    async def _on_audio_done(self, event: dict) -> None:
+        """Deliver remaining audio and transcript when response audio ends."""
+        await self._audio.flush()
+        await self._transcript.flush()
+
+    async def _on_response_done(self, event: dict) -> None:
+        """Report readiness after a response completes."""
+        await self._audio.flush()
+        await self._transcript.flush()
+        if self._cb_on_status is not None:
+            await self._cb_on_status("ready")
+
+    async def _on_error_event(self, event: dict) -> None:
+        """Log and forward an error event from the service."""
+        error_msg = event.get("error", {}).get("message", str(event))
+        logger.error("Voice Live error: %s", error_msg)
+        if self._cb_on_error is not None:
+            await self._cb_on_error(error_msg)
 
     async def _handle_function_call(self, event: dict) -> None:
         """Handle function call from the model."""
@@ -244,53 +632,51 @@ class VoiceLiveSession:
         call_id = event.get("call_id", "")
         arguments_str = event.get("arguments", "")
 
-        logger.info(f"Function call: {function_name} (call_id={call_id})")
+        logger.info("Function call: %s (call_id=%s)", function_name, call_id)
 
         # Parse arguments
         try:
-            arguments = json.loads(arguments_str) if arguments_str else {}
+            arguments = _loads(arguments_str) if arguments_str else {}
         except json.JSONDecodeError:
-            logger.error(f"Failed to parse function arguments: {arguments_str}")
+            logger.error("Failed to parse function arguments: %s", arguments_str)
             arguments = {}
 
         # Inject user_id for memory functions
         if function_name in ("search_memory", "add_memory"):
             arguments["user_id"] = self.user_id
-            logger.info(f"Injected user_id={self.user_id} for {function_name}")
-
-        logger.info(f"Executing function: {function_name} with args: {arguments}")
+            logger.info("Injected user_id=%s for %s", self.user_id, function_name)
 
-        # Call the tool handler
-        result = await handle_tool_call(function_name, arguments)
-        logger.info(f"Function result: {result}")
+        logger.info("Executing function: %s with args: %s", function_name, arguments)
 
-        # Notify via callback if set
-        if self.on_function_call:
-            await self._call_callback(self.on_function_call, function_name, arguments, result)
+        # Call the tool handler; unknown tools are rejected without a coroutine
+        if is_known_tool(function_name):
+            result = await handle_tool_call(function_name, arguments)
+        else:
+            result = unknown_tool_result(function_name)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Function result: %s", result)
 
-        # Send result back to Voice Live
+        # Send result back to Voice Live first, so the model can resume
+        # speaking without waiting on the notification callback
         if self._ws:
             response_msg = {
                 "type": "conversation.item.create",
                 "item": {
                     "type": "function_call_output",
                     "call_id": call_id,
-                    "output": json.dumps(result)
+                    "output": _dumps(result)
                 }
             }
-            await self._ws.send(json.dumps(response_msg))
-            logger.info(f"Function output sent for call_id={call_id}")
+            await self._ws.send(_dumps(response_msg))
+            logger.info("Function output sent for call_id=%s", call_id)
 
             # Request new response to continue the conversation
-            await self._ws.send(json.dumps({"type": "response.create"}))
+            await self._ws.send(_RESPONSE_CREATE_FRAME)
             logger.info("Requested new response after function call")
 
-    async def _call_callback(self, callback: Callable, *args) -> None:
-        """Call a callback, handling both sync and async callbacks."""
-        if asyncio.iscoroutinefunction(callback):
-            await callback(*args)
-        else:
-            callback(*args)
+        # Notify via callback if set
+        if self._cb_on_function_call is not None:
+            await self._cb_on_function_call(function_name, arguments, result)
 
     # Async context manager support
     async def __aenter__(self):
@@ -0,0 +1,118 @@
+"""Shared pytest fixtures."""
+
+import uuid
+from collections import deque
+from collections.abc import AsyncGenerator, Callable
+from types import ModuleType
+from typing import Any
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from src import memory_client, tool_handler
+
+# Unique ids handed out by uuid_pool per session (per worker under xdist)
+UUID_POOL_SIZE = 256
+
+# Seconds to wait for the real memory API before skipping tests that need it
+MEMORY_API_PROBE_TIMEOUT_SECONDS = 1.0
+
+# Dummy Voice Live credentials for sessions that never reach Azure
+TEST_ENDPOINT = "https://test.api.cognitive.microsoft.com/"
+TEST_API_KEY = "test-key"
+
+# Canned memory returned by the fake memory server for every search
+MOCK_MEMORY = {
+    "id": "mock-memory-1",
+    "text": "User's favorite color is blue",
+    "dist": 0.2,
+    "topics": ["preferences"],
+    "created_at": "2025-01-01T00:00:00Z",
+}
+
+
+def _mock_memory_server(request: httpx.Request) -> httpx.Response:
+    """Answer memory API requests with canned JSON."""
+    if request.url.path == memory_client._SEARCH_PATH:
+        return httpx.Response(200, json={"memories": [MOCK_MEMORY]})
+    return httpx.Response(200, json={"status": "ok"})
+
+
+@pytest_asyncio.fixture
+async def mock_memory_api(
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncGenerator[list[httpx.Request], None]:
+    """Serve the memory API in-process via httpx.MockTransport.
+
+    Also starts from empty tool handler caches so canned results don't leak
+    between tests.
+
+    Yields:
+        Requests received by the fake memory server, in order
+    """
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return _mock_memory_server(request)
+
+    monkeypatch.setattr(memory_client, "_MEMORY_ENABLED", True)
+    memory_client.set_http_client(
+        httpx.AsyncClient(base_url="http://memory.test", transport=httpx.MockTransport(handler))
+    )
+    monkeypatch.setattr(tool_handler, "_SEARCH_CACHE", {})
+    monkeypatch.setattr(tool_handler, "_SEARCH_INFLIGHT", {})
+    monkeypatch.setattr(tool_handler, "_ADD_INFLIGHT", {})
+    monkeypatch.setattr(tool_handler, "_ADD_RECENT", {})
+    yield requests
+    # Let background writes reach the fake server before it goes away
+    await memory_client.close_client()
+
+
+@pytest.fixture(scope="session")
+def uuid_pool() -> deque[str]:
+    """Unique hex ids generated once per session; tests popleft() from it."""
+    return deque(uuid.uuid4().hex for _ in range(UUID_POOL_SIZE))
+
+
+@pytest.fixture(scope="session")
+def memory_api_available() -> bool:
+    """Probe the real memory API once per session (per worker under xdist)."""
+    url = f"{memory_client._BASE_URL.rstrip('/')}/v1/health"
+    try:
+        # Any HTTP response means the server is reachable
+        httpx.get(url, timeout=MEMORY_API_PROBE_TIMEOUT_SECONDS)
+    except httpx.HTTPError:
+        return False
+    return True
+
+
+@pytest.fixture
+def require_memory_api(memory_api_available: bool) -> None:
+    """Skip the test when the real memory API can't be reached."""
+    if not memory_api_available:
+        pytest.skip(f"Memory API unreachable at {memory_client._BASE_URL}")
+
+
+@pytest.fixture(scope="session")
+def voice_live_module() -> ModuleType:
+    """The src.voice_live module, imported once per session."""
+    from src import voice_live
+
+    return voice_live
+
+
+@pytest.fixture
+def make_session(voice_live_module: ModuleType) -> Callable[..., Any]:
+    """Factory for VoiceLiveSession instances with test credentials.
+
+    Keyword arguments are passed through to the constructor.
+    """
+
+    def _make(**kwargs: Any) -> Any:
+        return voice_live_module.VoiceLiveSession(
+            endpoint=TEST_ENDPOINT, api_key=TEST_API_KEY, **kwargs
+        )
+
+    return _make
@@ -21,7 +21,6 @@ import json
 class TestWebSocketFlow:
     """End-to-end tests for WebSocket voice flow."""
 
-    @pytest.mark.asyncio
     async def test_full_connection_flow(self):
         """Test complete connection flow: connect -> receive connected -> ready."""
         from fastapi.testclient import TestClient
@@ -34,7 +33,6 @@ class TestWebSocketFlow:
             data = websocket.receive_json()
             assert data["type"] == "connected"
 
-    @pytest.mark.asyncio
     async def test_audio_round_trip(self):
         """Test sending audio and receiving a response."""
         from fastapi.testclient import TestClient
@@ -56,7 +54,6 @@ class TestWebSocketFlow:
             # This depends on Voice Live API being mocked
             # For now, just verify no exception is raised
 
-    @pytest.mark.asyncio
     async def test_barge_in_signal(self):
         """Test that server sends clear_audio on speech detection."""
         from fastapi.testclient import TestClient
@@ -100,20 +97,17 @@ class TestServerStartup:
 class TestIntegrationWithMockedVoiceLive:
     """Integration tests with Voice Live API mocked."""
 
-    @pytest.mark.asyncio
     async def test_server_handles_voice_live_connection(self):
         """Server should establish Voice Live connection on WebSocket connect."""
         # This test verifies the server correctly initializes
         # VoiceLiveSession when a client connects
         pass  # Placeholder for implementation
 
-    @pytest.mark.asyncio
     async def test_audio_forwarded_to_voice_live(self):
         """Audio from client should be forwarded to Voice Live."""
         # This test verifies audio messages are passed through
         pass  # Placeholder for implementation
 
-    @pytest.mark.asyncio
     async def test_voice_live_audio_forwarded_to_client(self):
         """Audio from Voice Live should be forwarded to client."""
         # This test verifies audio responses are passed back
@@ -0,0 +1,166 @@
+"""Unit tests for structured JSON logging."""
+
+import asyncio
+import io
+import json
+import logging
+
+import pytest
+
+from src import logging_config
+from src.logging_config import (
+    SUCCESS_MESSAGE,
+    JSONBytesHandler,
+    JSONFormatter,
+    get_log_level,
+    log_api_call,
+)
+
+
+def _make_record(msg: str, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("memory", logging.INFO, __file__, 1, msg, None, None)
+    record.created = 1760000000.123456
+    record.__dict__.update(extra)
+    return record
+
+
+class TestGetLogLevel:
+    """LOG_LEVEL resolves to a logging constant."""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            ("debug", logging.DEBUG),
+            ("WARNING", logging.WARNING),
+            ("verbose", logging.INFO),
+            ("BASIC_FORMAT", logging.INFO),
+        ],
+    )
+    def test_level_from_env(self, monkeypatch, value, expected) -> None:
+        monkeypatch.setenv("LOG_LEVEL", value)
+        assert get_log_level() == expected
+
+
+class TestJSONFormatter:
+    """The templated success path must match the generic serializer."""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    @pytest.mark.parametrize(
+        "extra",
+        [
+            {"operation": "add_memory", "latency_ms": 12.34, "status": "success"},
+            {
+                "operation": "search_memory",
+                "user_id": "usér \"quoted\"",
+                "latency_ms": 0.5,
+                "result_count": 3,
+                "status": "success",
+                "api_endpoint": "/v1/long-term-memory/search",
+            },
+        ],
+    )
+    def test_success_fast_path_matches_generic(self, monkeypatch, use_orjson, extra) -> None:
+        if use_orjson and logging_config.orjson is None:
+            pytest.skip("orjson not installed")
+        if not use_orjson:
+            monkeypatch.setattr(logging_config, "orjson", None)
+
+        formatter = JSONFormatter()
+        fast = formatter.format(_make_record(SUCCESS_MESSAGE, **extra))
+        # An equal but non-identical message string forces the generic path
+        generic_msg = SUCCESS_MESSAGE[:1] + SUCCESS_MESSAGE[1:]
+        assert generic_msg is not SUCCESS_MESSAGE
+        generic = formatter.format(_make_record(generic_msg, **extra))
+
+        assert fast == generic
+        assert json.loads(fast)["message"] == SUCCESS_MESSAGE
+
+    def test_generic_path_round_trips(self) -> None:
+        record = _make_record("failed for %s", error_type="ValueError", error_message='bad "x" – é')
+        record.args = ("usér",)
+        record.levelno, record.levelname = logging.ERROR, "ERROR"
+
+        data = json.loads(JSONFormatter().format(record))
+
+        assert data == {
+            "timestamp": record.created,
+            "level": "ERROR",
+            "logger": "memory",
+            "message": "failed for usér",
+            "error_type": "ValueError",
+            "error_message": 'bad "x" – é',
+        }
+
+
+class TestJSONBytesHandler:
+    """Records are written to the binary buffer as UTF-8 lines."""
+
+    def test_writes_utf8_lines_to_buffer(self) -> None:
+        raw = io.BytesIO()
+        handler = JSONBytesHandler(io.TextIOWrapper(raw, encoding="utf-8"))
+        handler.setFormatter(JSONFormatter())
+
+        handler.handle(_make_record("héllo"))
+        handler.handle(_make_record("world"))
+
+        lines = raw.getvalue().split(b"\n")
+        assert lines[-1] == b""
+        assert [json.loads(line)["message"] for line in lines[:-1]] == ["héllo", "world"]
+
+    def test_falls_back_to_text_stream(self) -> None:
+        stream = io.StringIO()
+        handler = JSONBytesHandler(stream)
+        handler.setFormatter(JSONFormatter())
+
+        handler.handle(_make_record("plain"))
+
+        assert json.loads(stream.getvalue())["message"] == "plain"
+
+
+class TestLogApiCall:
+    """LogApiCall emits one structured record per call."""
+
+    def test_success_logs_result_count(self, caplog, monkeypatch) -> None:
+        async def run() -> None:
+            async with log_api_call("search_memory", user_id="u1") as ctx:
+                ctx["result_count"] = 2
+
+        monkeypatch.setattr(logging.getLogger("memory"), "propagate", True)
+        with caplog.at_level(logging.INFO, logger="memory"):
+            asyncio.run(run())
+
+        (record,) = caplog.records
+        assert record.msg is SUCCESS_MESSAGE
+        assert record.status == "success"
+        assert record.result_count == 2
+        assert record.user_id == "u1"
+        assert record.latency_ms >= 0
+
+    def test_error_is_logged_and_reraised(self, caplog, monkeypatch) -> None:
+        async def run() -> None:
+            async with log_api_call("add_memory"):
+                raise ValueError("boom")
+
+        monkeypatch.setattr(logging.getLogger("memory"), "propagate", True)
+        with caplog.at_level(logging.INFO, logger="memory"), pytest.raises(ValueError):
+            asyncio.run(run())
+
+        (record,) = caplog.records
+        assert record.status == "error"
+        assert record.error_type == "ValueError"
+        assert record.error_message == "boom"
+
+    def test_success_skipped_when_info_disabled(self, caplog, monkeypatch) -> None:
+        async def run() -> None:
+            async with log_api_call("search_memory"):
+                pass
+            async with log_api_call("add_memory"):
+                raise ValueError("boom")
+
+        monkeypatch.setattr(logging.getLogger("memory"), "propagate", True)
+        with caplog.at_level(logging.WARNING, logger="memory"), pytest.raises(ValueError):
+            asyncio.run(run())
+
+        (record,) = caplog.records
+        assert record.status == "error"
+        assert record.operation == "add_memory"
@@ -1,15 +1,24 @@
-"""Tests for memory client - ALL tests call REAL jarvis-cloud API."""
+"""Tests for memory client.
+
+Classes marked integration call the REAL jarvis-cloud API and are skipped
+when it is unreachable; the rest run without network access.
+"""
 
 import asyncio
+import json
 import uuid
 from typing import AsyncGenerator
 
+import httpx
 import pytest
+import pytest_asyncio
 
+from src import memory_client
 from src.memory_client import (
     add_memory,
     delete_user_memories,
     get_memories,
+    reload_config,
     search_memory,
 )
 
@@ -17,13 +26,15 @@ from src.memory_client import (
 TEST_USER_ID = "jarvis_integration_test_user"
 
 
-@pytest.fixture(autouse=True)
+@pytest_asyncio.fixture
 async def cleanup_test_memories() -> AsyncGenerator[None, None]:
     """Clean up test memories after each test."""
     yield
     await delete_user_memories(TEST_USER_ID)
 
 
+@pytest.mark.integration
+@pytest.mark.usefixtures("require_memory_api", "cleanup_test_memories")
 class TestSearchMemory:
     """Tests for search_memory function with REAL API."""
 
@@ -46,6 +57,8 @@ class TestSearchMemory:
         assert isinstance(results, list)
 
 
+@pytest.mark.integration
+@pytest.mark.usefixtures("require_memory_api", "cleanup_test_memories")
 class TestAddMemory:
     """Tests for add_memory function with REAL API."""
 
@@ -68,6 +81,8 @@ class TestAddMemory:
         assert isinstance(result, dict)
 
 
+@pytest.mark.integration
+@pytest.mark.usefixtures("require_memory_api", "cleanup_test_memories")
 class TestGetMemories:
     """Tests for get_memories function with REAL API."""
 
@@ -83,54 +98,197 @@ class TestGetMemories:
         assert len(result) <= 5
 
 
+@pytest.mark.integration
+@pytest.mark.usefixtures("require_memory_api", "cleanup_test_memories")
 class TestGracefulDegradation:
     """Tests for graceful degradation on failures."""
 
     async def test_search_timeout_returns_empty_list(self) -> None:
         """Search with very short timeout returns empty list, not exception."""
-        import os
-
         # Set artificially short timeout
-        original = os.environ.get("MEMORY_TIMEOUT_SECONDS")
-        os.environ["MEMORY_TIMEOUT_SECONDS"] = "0.001"
-
-        try:
+        with memory_client.set_timeout(0.001):
             result = await search_memory("test", TEST_USER_ID)
-            assert result == []
-        finally:
-            if original:
-                os.environ["MEMORY_TIMEOUT_SECONDS"] = original
-            else:
-                os.environ.pop("MEMORY_TIMEOUT_SECONDS", None)
+        assert result == []
 
     async def test_add_memory_timeout_returns_empty_dict(self) -> None:
         """Add memory with very short timeout returns empty dict, not exception."""
-        import os
-
-        original = os.environ.get("MEMORY_TIMEOUT_SECONDS")
-        os.environ["MEMORY_TIMEOUT_SECONDS"] = "0.001"
-
-        try:
+        # Set artificially short timeout
+        with memory_client.set_timeout(0.001):
             result = await add_memory("test fact", TEST_USER_ID)
-            assert result == {}
-        finally:
-            if original:
-                os.environ["MEMORY_TIMEOUT_SECONDS"] = original
-            else:
-                os.environ.pop("MEMORY_TIMEOUT_SECONDS", None)
+        assert result == {}
 
     async def test_get_memories_timeout_returns_empty_list(self) -> None:
         """Get memories with very short timeout returns empty list, not exception."""
-        import os
+        # Set artificially short timeout
+        with memory_client.set_timeout(0.001):
+            result = await get_memories(TEST_USER_ID)
+        assert result == []
 
-        original = os.environ.get("MEMORY_TIMEOUT_SECONDS")
-        os.environ["MEMORY_TIMEOUT_SECONDS"] = "0.001"
 
-        try:
-            result = await get_memories(TEST_USER_ID)
-            assert result == []
-        finally:
-            if original:
-                os.environ["MEMORY_TIMEOUT_SECONDS"] = original
-            else:
-                os.environ.pop("MEMORY_TIMEOUT_SECONDS", None)
+def _install_mock_transport(handler) -> None:
+    """Point the shared memory client at an in-process MockTransport."""
+    memory_client.set_http_client(
+        httpx.AsyncClient(
+            base_url="http://memory.test",
+            transport=httpx.MockTransport(handler),
+        )
+    )
+
+
+class TestMemoryWriterBatching:
+    """Tests for add_memory write coalescing (no network)."""
+
+    def test_concurrent_adds_share_one_post(self) -> None:
+        """N concurrent add_memory calls are sent as a single POST."""
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"status": "ok"})
+
+        async def run() -> list[dict]:
+            _install_mock_transport(handler)
+            try:
+                return await asyncio.gather(
+                    *(add_memory(f"fact {i}", TEST_USER_ID) for i in range(5))
+                )
+            finally:
+                await memory_client.close_client()
+
+        results = asyncio.run(run())
+
+        assert results == [{"status": "ok"}] * 5
+        assert len(requests) == 1
+        body = json.loads(requests[0].content)
+        assert [m["text"] for m in body["memories"]] == [f"fact {i}" for i in range(5)]
+
+    def test_rejected_user_does_not_fail_other_users(self) -> None:
+        """Batches are posted per user, so one rejected user only fails itself."""
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            users = {m["user_id"] for m in json.loads(request.content)["memories"]}
+            if "unregistered" in users:
+                return httpx.Response(404, json={"detail": "User not found"})
+            return httpx.Response(200, json={"status": "ok"})
+
+        async def run() -> list[dict]:
+            _install_mock_transport(handler)
+            try:
+                return await asyncio.gather(
+                    add_memory("likes tea", "alice"),
+                    add_memory("x", "unregistered"),
+                    add_memory("likes jazz", "alice"),
+                )
+            finally:
+                await memory_client.close_client()
+
+        results = asyncio.run(run())
+
+        assert results == [{"status": "ok"}, {}, {"status": "ok"}]
+        assert results[0] is not results[2]
+        posted = sorted(
+            [m["user_id"] for m in json.loads(r.content)["memories"]] for r in requests
+        )
+        assert posted == [["alice", "alice"], ["unregistered"]]
+
+    def test_add_after_event_loop_switch(self) -> None:
+        """A write left pending on a closed loop doesn't block later loops."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"status": "ok"})
+
+        async def abandon_write() -> None:
+            memory_client._writer.submit({"user_id": TEST_USER_ID, "text": "lost"})
+
+        stale_loop = asyncio.new_event_loop()
+        stale_loop.run_until_complete(abandon_write())
+        # Finish the abandoned flush task so it isn't reported as destroyed
+        # while pending, but leave the writer bound to the stale loop
+        for task in asyncio.all_tasks(stale_loop):
+            task.cancel()
+        stale_loop.run_until_complete(asyncio.sleep(0))
+        stale_loop.close()
+
+        async def run() -> dict:
+            _install_mock_transport(handler)
+            try:
+                return await asyncio.wait_for(add_memory("fact", TEST_USER_ID), 2.0)
+            finally:
+                await memory_client.close_client()
+
+        assert asyncio.run(run()) == {"status": "ok"}
+
+
+class TestSharedClient:
+    """Tests for the shared HTTP client lifecycle (no network)."""
+
+    def test_stale_client_closed_on_loop_switch(self) -> None:
+        """A client created on a previous loop is closed when replaced."""
+
+        async def create() -> httpx.AsyncClient:
+            return await memory_client.get_client()
+
+        stale = asyncio.run(create())
+
+        async def replace() -> httpx.AsyncClient:
+            try:
+                return await memory_client.get_client()
+            finally:
+                await memory_client.close_client()
+
+        fresh = asyncio.run(replace())
+
+        assert fresh is not stale
+        assert stale.is_closed
+
+    def test_set_http_client_used_by_get_client(self) -> None:
+        """An installed client is returned by get_client() on the same loop."""
+
+        async def run() -> tuple[httpx.AsyncClient, httpx.AsyncClient]:
+            client = httpx.AsyncClient(base_url="http://memory.test")
+            memory_client.set_http_client(client)
+            try:
+                return client, await memory_client.get_client()
+            finally:
+                await memory_client.close_client()
+
+        installed, used = asyncio.run(run())
+
+        assert used is installed
+        assert installed.is_closed
+
+    def test_set_timeout_applies_and_restores(self) -> None:
+        """set_timeout() overrides the client timeout only inside the block."""
+
+        async def run() -> tuple[httpx.Timeout, httpx.Timeout, httpx.Timeout]:
+            client = await memory_client.get_client()
+            try:
+                before = client.timeout
+                with memory_client.set_timeout(0.25):
+                    during = (await memory_client.get_client()).timeout
+                return before, during, client.timeout
+            finally:
+                await memory_client.close_client()
+
+        before, during, after = asyncio.run(run())
+
+        assert during == httpx.Timeout(0.25)
+        assert after == before
+
+    def test_reload_config_updates_client_timeout(self, monkeypatch) -> None:
+        """reload_config() applies a new timeout to the existing client."""
+
+        async def run() -> httpx.Timeout:
+            client = await memory_client.get_client()
+            try:
+                monkeypatch.setenv("MEMORY_TIMEOUT_SECONDS", "2.5")
+                reload_config()
+                return client.timeout
+            finally:
+                monkeypatch.delenv("MEMORY_TIMEOUT_SECONDS")
+                reload_config()
+                await memory_client.close_client()
+
+        assert asyncio.run(run()) == httpx.Timeout(2.5)
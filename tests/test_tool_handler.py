@@ -1,12 +1,23 @@
-"""Unit tests for the tool call handler."""
+"""Unit tests for the tool call handler.
+
+The memory server is replaced by the in-process mock_memory_api fixture.
+"""
+
+import asyncio
+import json
 
 import pytest
 
-from src.tool_handler import handle_tool_call
+from src import tool_handler
+from src.memory_client import close_client
+from src.tool_handler import handle_tool_call, handle_tool_calls
+
+pytestmark = pytest.mark.usefixtures("mock_memory_api")
+
+USER = "jarvis_integration_test_user"
 
 
-@pytest.mark.asyncio
-async def test_search_memory_routing() -> None:
+async def test_search_memory_routing(mock_memory_api) -> None:
     """Test that search_memory calls are routed to memory client correctly."""
     result = await handle_tool_call(
         "search_memory",
@@ -17,10 +28,11 @@ async def test_search_memory_routing() -> None:
     assert "memories" in result
     assert "count" in result
     assert isinstance(result["memories"], list)
+    assert result["count"] == 1
+    assert [r.url.path for r in mock_memory_api] == ["/v1/long-term-memory/search"]
 
 
-@pytest.mark.asyncio
-async def test_add_memory_routing() -> None:
+async def test_add_memory_routing(mock_memory_api) -> None:
     """Test that add_memory calls are routed to memory client correctly."""
     result = await handle_tool_call(
         "add_memory",
@@ -33,9 +45,11 @@ async def test_add_memory_routing() -> None:
         assert "memory" in result
     else:
         assert "error" in result
+    # The write lands in the background
+    await close_client()
+    assert [r.url.path for r in mock_memory_api] == ["/v1/long-term-memory/"]
 
 
-@pytest.mark.asyncio
 async def test_unknown_tool_name_returns_error() -> None:
     """Test that unknown tool names return an error response."""
     result = await handle_tool_call(
@@ -48,100 +62,249 @@ async def test_unknown_tool_name_returns_error() -> None:
     assert "Unknown tool" in result["error"]
 
 
-@pytest.mark.asyncio
-async def test_search_memory_missing_query() -> None:
-    """Test search_memory with missing query argument."""
-    result = await handle_tool_call(
-        "search_memory",
-        {"user_id": "jarvis_integration_test_user"},
-    )
+@pytest.mark.parametrize(
+    ("tool", "arguments", "expected_error"),
+    [
+        ("search_memory", {"user_id": USER}, "Missing required"),
+        ("search_memory", {"query": "test query"}, "Missing required"),
+        ("add_memory", {"user_id": USER}, "Missing required"),
+        ("add_memory", {"text": "test fact"}, "Missing required"),
+        ("search_memory", {"query": 123, "user_id": USER}, "must be strings"),
+        ("add_memory", {"text": ["list", "not", "string"], "user_id": USER}, "must be strings"),
+        ("search_memory", {}, "Missing required"),
+        ("add_memory", {"text": None, "user_id": USER}, "Missing required"),
+    ],
+    ids=[
+        "search-missing-query",
+        "search-missing-user-id",
+        "add-missing-text",
+        "add-missing-user-id",
+        "search-invalid-query-type",
+        "add-invalid-text-type",
+        "empty-arguments",
+        "none-argument",
+    ],
+)
+async def test_invalid_arguments_rejected(tool, arguments, expected_error) -> None:
+    """Test that missing, empty, None and non-string arguments return an error."""
+    result = await handle_tool_call(tool, arguments)
 
     assert result["success"] is False
     assert "error" in result
-    assert "Missing required" in result["error"]
+    assert expected_error in result["error"]
 
 
-@pytest.mark.asyncio
-async def test_search_memory_missing_user_id() -> None:
-    """Test search_memory with missing user_id argument."""
-    result = await handle_tool_call(
-        "search_memory",
-        {"query": "test query"},
-    )
+async def test_add_memory_returns_before_write_completes(monkeypatch) -> None:
+    """Test that add_memory acknowledges immediately and records telemetry on completion."""
+    release = asyncio.Event()
+    events = []
 
-    assert result["success"] is False
-    assert "error" in result
-    assert "Missing required" in result["error"]
+    async def slow_add(text, user_id):
+        await release.wait()
+        return {"id": "m1"}
 
+    def fake_add_memory_bg(text, user_id):
+        return asyncio.create_task(slow_add(text, user_id))
 
-@pytest.mark.asyncio
-async def test_add_memory_missing_text() -> None:
-    """Test add_memory with missing text argument."""
-    result = await handle_tool_call(
-        "add_memory",
-        {"user_id": "jarvis_integration_test_user"},
+    monkeypatch.setattr(tool_handler, "add_memory_bg", fake_add_memory_bg)
+    monkeypatch.setattr(
+        tool_handler,
+        "_record_memory_event",
+        lambda operation, user_id, latency_ms, success, **extra: events.append(
+            (operation, user_id, success)
+        ),
     )
 
-    assert result["success"] is False
-    assert "error" in result
-    assert "Missing required" in result["error"]
+    result = await handle_tool_call("add_memory", {"text": "fact", "user_id": "u1"})
 
+    assert result == {"success": True, "memory": None, "message": "Memory is being stored"}
+    assert events == []
 
-@pytest.mark.asyncio
-async def test_add_memory_missing_user_id() -> None:
-    """Test add_memory with missing user_id argument."""
-    result = await handle_tool_call(
-        "add_memory",
-        {"text": "test fact"},
-    )
+    release.set()
+    for _ in range(3):
+        await asyncio.sleep(0)
 
-    assert result["success"] is False
-    assert "error" in result
-    assert "Missing required" in result["error"]
+    assert events == [("add", "u1", True)]
 
 
-@pytest.mark.asyncio
-async def test_search_memory_invalid_query_type() -> None:
-    """Test search_memory with invalid query type."""
-    result = await handle_tool_call(
-        "search_memory",
-        {"query": 123, "user_id": "jarvis_integration_test_user"},
-    )
+@pytest.fixture
+def counting_search(monkeypatch):
+    """Replace search_memory with a counting stub; mock_memory_api resets the cache."""
+    calls = []
 
-    assert result["success"] is False
-    assert "error" in result
-    assert "must be strings" in result["error"]
+    async def fake_search(query, user_id):
+        calls.append((query, user_id))
+        await asyncio.sleep(0)
+        return [{"text": f"memory for {query}"}]
 
+    monkeypatch.setattr(tool_handler, "search_memory", fake_search)
+    monkeypatch.setattr(tool_handler, "_SEARCH_CACHE_TTL", 300.0)
+    return calls
 
-@pytest.mark.asyncio
-async def test_add_memory_invalid_text_type() -> None:
-    """Test add_memory with invalid text type."""
-    result = await handle_tool_call(
-        "add_memory",
-        {"text": ["list", "not", "string"], "user_id": "jarvis_integration_test_user"},
+
+async def test_search_memory_repeat_served_from_cache(counting_search) -> None:
+    """Test that a repeated (normalized) query doesn't hit the memory server again."""
+    first = await handle_tool_call("search_memory", {"query": "Favorite color", "user_id": "u1"})
+    second = await handle_tool_call("search_memory", {"query": " favorite color ", "user_id": "u1"})
+
+    assert first == second
+    assert len(counting_search) == 1
+
+
+async def test_search_memory_concurrent_duplicates_coalesce(counting_search) -> None:
+    """Test that concurrent identical searches share one request."""
+    results = await asyncio.gather(
+        *(handle_tool_call("search_memory", {"query": "pets", "user_id": "u1"}) for _ in range(3))
     )
 
-    assert result["success"] is False
-    assert "error" in result
-    assert "must be strings" in result["error"]
+    assert all(result["count"] == 1 for result in results)
+    assert len(counting_search) == 1
 
 
-@pytest.mark.asyncio
-async def test_empty_arguments() -> None:
-    """Test tool calls with empty arguments dict."""
-    result = await handle_tool_call("search_memory", {})
+async def test_search_memory_leader_cancel_spares_followers(counting_search) -> None:
+    """Test that cancelling the first caller doesn't cancel a shared search."""
+    args = {"query": "pets", "user_id": "u1"}
+    leader = asyncio.create_task(handle_tool_call("search_memory", args))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(handle_tool_call("search_memory", args))
+    await asyncio.sleep(0)
 
-    assert result["success"] is False
-    assert "error" in result
+    leader.cancel()
+    result = await follower
 
+    assert leader.cancelled()
+    assert result["count"] == 1
+    assert len(counting_search) == 1
 
-@pytest.mark.asyncio
-async def test_none_arguments() -> None:
-    """Test tool calls with None values in arguments."""
-    result = await handle_tool_call(
-        "add_memory",
-        {"text": None, "user_id": "jarvis_integration_test_user"},
+
+async def test_add_memory_invalidates_user_search_cache(counting_search, monkeypatch) -> None:
+    """Test that adding a memory drops that user's cached search results."""
+    monkeypatch.setattr(
+        tool_handler,
+        "add_memory_bg",
+        lambda text, user_id: asyncio.create_task(asyncio.sleep(0)),
     )
 
-    assert result["success"] is False
-    assert "error" in result
+    await handle_tool_call("search_memory", {"query": "pets", "user_id": "u1"})
+    await handle_tool_call("search_memory", {"query": "pets", "user_id": "u2"})
+    await handle_tool_call("add_memory", {"text": "I have a cat", "user_id": "u1"})
+    await handle_tool_call("search_memory", {"query": "pets", "user_id": "u1"})
+    await handle_tool_call("search_memory", {"query": "pets", "user_id": "u2"})
+
+    assert counting_search == [("pets", "u1"), ("pets", "u2"), ("pets", "u1")]
+
+
+async def test_batch_search_memory_routing(counting_search) -> None:
+    """Test that a batch of searches runs concurrently and keeps call order."""
+    calls = [
+        {"name": "search_memory", "arguments": {"query": f"topic {i}", "user_id": "u1"}}
+        for i in range(10)
+    ]
+
+    results = await handle_tool_calls(calls)
+
+    assert len(results) == 10
+    assert [r["memories"][0]["text"] for r in results] == [f"memory for topic {i}" for i in range(10)]
+    assert len(counting_search) == 10
+
+
+async def test_batch_mixed_tools_routing(counting_search, monkeypatch) -> None:
+    """Test that a mixed batch returns one response per call, in order."""
+    monkeypatch.setattr(
+        tool_handler,
+        "add_memory_bg",
+        lambda text, user_id: asyncio.create_task(asyncio.sleep(0)),
+    )
+    calls = []
+    for i in range(3):
+        calls.append({"name": "search_memory", "arguments": {"query": "pets", "user_id": "u1"}})
+        calls.append({"name": "add_memory", "arguments": {"text": f"fact {i}", "user_id": "u2"}})
+        calls.append({"name": "unknown_tool", "arguments": {}})
+    calls.append({"name": "search_memory"})
+
+    results = await handle_tool_calls(calls)
+
+    assert len(results) == 10
+    for i in range(0, 9, 3):
+        assert results[i]["count"] == 1
+        assert results[i + 1]["message"] == "Memory is being stored"
+        assert "Unknown tool" in results[i + 2]["error"]
+    assert "Missing required" in results[9]["error"]
+    # Identical concurrent searches share one request
+    assert counting_search == [("pets", "u1")]
+
+
+async def test_batch_request_counts(mock_memory_api) -> None:
+    """Test the HTTP requests a batch makes: identical searches and all adds collapse."""
+    distinct = [
+        {"name": "search_memory", "arguments": {"query": f"topic {i}", "user_id": USER}}
+        for i in range(10)
+    ]
+    identical = [
+        {"name": "search_memory", "arguments": {"query": "pets", "user_id": USER}}
+    ] * 10
+    adds = [
+        {"name": "add_memory", "arguments": {"text": f"fact {i}", "user_id": USER}}
+        for i in range(10)
+    ]
+
+    await handle_tool_calls(distinct)
+    searches = len(mock_memory_api)
+    await handle_tool_calls(identical)
+    identical_searches = len(mock_memory_api) - searches
+    await handle_tool_calls(adds)
+    # Background writes are coalesced by the memory client's writer
+    await close_client()
+    posts = mock_memory_api[searches + identical_searches:]
+
+    # No batch search endpoint exists, so distinct searches fan out one each
+    assert searches == 10
+    assert identical_searches == 1
+    assert [r.url.path for r in posts] == ["/v1/long-term-memory/"]
+    assert len(json.loads(posts[0].content)["memories"]) == 10
+
+
+async def test_duplicate_add_memory_writes_once(monkeypatch) -> None:
+    """Test that identical concurrent and back-to-back adds issue a single write."""
+    writes = []
+
+    async def fake_add(text, user_id):
+        await asyncio.sleep(0)
+        return {"id": "m1"}
+
+    def fake_add_memory_bg(text, user_id):
+        writes.append((text, user_id))
+        return asyncio.create_task(fake_add(text, user_id))
+
+    monkeypatch.setattr(tool_handler, "add_memory_bg", fake_add_memory_bg)
+    args = {"text": "My name is Sam", "user_id": "u1"}
+
+    await asyncio.gather(handle_tool_call("add_memory", args), handle_tool_call("add_memory", args))
+    for _ in range(3):
+        await asyncio.sleep(0)
+    repeat = await handle_tool_call("add_memory", args)
+    await handle_tool_call("add_memory", {"text": "My name is Sam", "user_id": "u2"})
+
+    assert repeat["success"] is True
+    assert writes == [("My name is Sam", "u1"), ("My name is Sam", "u2")]
+
+
+def test_record_memory_event_sets_attributes_in_bulk(monkeypatch) -> None:
+    """Test that telemetry attributes are set with one set_attributes call."""
+    from unittest.mock import MagicMock
+
+    tracer = MagicMock()
+    monkeypatch.setattr(tool_handler, "tracer", tracer)
+
+    tool_handler._record_memory_event_traced("search", "u1", 12.5, True, result_count=2)
+
+    tracer.start_as_current_span.assert_called_once_with("memory.search")
+    span = tracer.start_as_current_span.return_value.__enter__.return_value
+    span.set_attributes.assert_called_once_with({
+        "memory.operation": "search",
+        "memory.user_id": "u1",
+        "memory.latency_ms": 12.5,
+        "memory.success": True,
+        "memory.result_count": 2,
+    })
+    span.set_attribute.assert_not_called()
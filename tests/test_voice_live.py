@@ -12,9 +12,13 @@ IMPORTANT: These tests are based on the ACTUAL Azure SDK API (validated via Micr
 These tests should FAIL initially (red phase of TDD) since no implementation exists.
 """
 
+import asyncio
+import base64
+import inspect
+import json
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-import asyncio
 
 
 class TestVoiceLiveSessionExists:
@@ -42,148 +46,115 @@ class TestVoiceLiveSessionExists:
 class TestVoiceLiveSessionInit:
     """Tests for VoiceLiveSession initialization."""
 
-    def test_init_accepts_endpoint_and_key(self):
+    def test_init_accepts_endpoint_and_key(self, make_session):
         """VoiceLiveSession should accept endpoint and api_key parameters."""
-        from src.voice_live import VoiceLiveSession
-
-        session = VoiceLiveSession(
-            endpoint="https://test.api.cognitive.microsoft.com/",
-            api_key="test-key"
-        )
+        session = make_session()
         assert session is not None
 
-    def test_init_accepts_model_parameter(self):
+    def test_init_accepts_model_parameter(self, make_session):
         """VoiceLiveSession should accept optional model parameter."""
-        from src.voice_live import VoiceLiveSession
-
-        session = VoiceLiveSession(
-            endpoint="https://test.api.cognitive.microsoft.com/",
-            api_key="test-key",
-            model="gpt-4o-mini-realtime-preview"
-        )
+        session = make_session(model="gpt-4o-mini-realtime-preview")
         assert session is not None
 
-    def test_init_accepts_voice_parameter(self):
+    def test_init_accepts_voice_parameter(self, make_session):
         """VoiceLiveSession should accept optional voice parameter."""
-        from src.voice_live import VoiceLiveSession
-
-        session = VoiceLiveSession(
-            endpoint="https://test.api.cognitive.microsoft.com/",
-            api_key="test-key",
-            voice="en-US-AvaNeural"
-        )
+        session = make_session(voice="en-US-AvaNeural")
         assert session is not None
 
 
 class TestVoiceLiveSessionMethods:
     """Tests for VoiceLiveSession methods."""
 
-    def test_connect_method_exists(self):
+    def test_connect_method_exists(self, make_session):
         """VoiceLiveSession should have a connect() method."""
-        from src.voice_live import VoiceLiveSession
-
-        session = VoiceLiveSession(
-            endpoint="https://test.api.cognitive.microsoft.com/",
-            api_key="test-key"
-        )
+        session = make_session()
         assert hasattr(session, 'connect')
         assert callable(session.connect)
 
-    def test_connect_is_async(self):
+    def test_connect_is_async(self, make_session):
         """connect() should be an async method."""
-        from src.voice_live import VoiceLiveSession
-        import inspect
-
-        session = VoiceLiveSession(
-            endpoint="https://test.api.cognitive.microsoft.com/",
-            api_key="test-key"
-        )
+        session = make_session()
         assert inspect.iscoroutinefunction(session.connect)
 
-    def test_disconnect_method_exists(self):
+    def test_disconnect_method_exists(self, make_session):
         """VoiceLiveSession should have a disconnect() method."""
-        from src.voice_live import VoiceLiveSession
-
-        session = VoiceLiveSession(
-            endpoint="https://test.api.cognitive.microsoft.com/",
-            api_key="test-key"
-        )
+        session = make_session()
         assert hasattr(session, 'disconnect')
         assert callable(session.disconnect)
 
-    def test_send_audio_method_exists(self):
+    def test_send_audio_method_exists(self, make_session):
         """VoiceLiveSession should have a send_audio() method."""
-        from src.voice_live import VoiceLiveSession
-
-        session = VoiceLiveSession(
-            endpoint="https://test.api.cognitive.microsoft.com/",
-            api_key="test-key"
-        )
+        session = make_session()
         assert hasattr(session, 'send_audio')
         assert callable(session.send_audio)
 
-    def test_send_audio_is_async(self):
+    def test_send_audio_is_async(self, make_session):
         """send_audio() should be an async method."""
-        from src.voice_live import VoiceLiveSession
-        import inspect
-
-        session = VoiceLiveSession(
-            endpoint="https://test.api.cognitive.microsoft.com/",
-            api_key="test-key"
-        )
+        session = make_session()
         assert inspect.iscoroutinefunction(session.send_audio)
 
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_connect_passes_prebuilt_headers(self, make_session, voice_live_module):
+        """connect() sends the api-key header built once in __init__."""
+        session = make_session()
+        ws = AsyncMock()
+        ws.recv.side_effect = ['{"type":"session.created"}', '{"type":"session.updated"}']
+        ws.__aiter__.return_value = []
+
+        with patch.object(voice_live_module, "ws_connect", AsyncMock(return_value=ws)) as connect:
+            await session.connect()
+            await session.disconnect()
+
+        assert connect.await_args.kwargs["additional_headers"] == (("api-key", "test-key"),)
+        assert connect.await_args.kwargs["additional_headers"] is session._ws_headers
+
+    @pytest.mark.parametrize(("kwargs", "expected"), [({}, None), ({"compression": "deflate"}, "deflate")])
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_connect_compression_off_by_default(self, make_session, voice_live_module, kwargs, expected):
+        """connect() disables permessage-deflate unless asked and raises max_size."""
+        session = make_session(**kwargs)
+        ws = AsyncMock()
+        ws.recv.side_effect = ['{"type":"session.created"}', '{"type":"session.updated"}']
+        ws.__aiter__.return_value = []
+
+        with patch.object(voice_live_module, "ws_connect", AsyncMock(return_value=ws)) as connect:
+            await session.connect()
+            await session.disconnect()
+
+        assert connect.await_args.kwargs["compression"] == expected
+        assert connect.await_args.kwargs["max_size"] == voice_live_module.WS_MAX_SIZE
+
 
 class TestVoiceLiveSessionCallbacks:
     """Tests for VoiceLiveSession callback registration."""
 
-    def test_on_audio_callback_settable(self):
+    def test_on_audio_callback_settable(self, make_session):
         """VoiceLiveSession should allow setting on_audio callback."""
-        from src.voice_live import VoiceLiveSession
-
-        session = VoiceLiveSession(
-            endpoint="https://test.api.cognitive.microsoft.com/",
-            api_key="test-key"
-        )
+        session = make_session()
 
         callback = AsyncMock()
         session.on_audio = callback
         assert session.on_audio == callback
 
-    def test_on_transcript_callback_settable(self):
+    def test_on_transcript_callback_settable(self, make_session):
         """VoiceLiveSession should allow setting on_transcript callback."""
-        from src.voice_live import VoiceLiveSession
-
-        session = VoiceLiveSession(
-            endpoint="https://test.api.cognitive.microsoft.com/",
-            api_key="test-key"
-        )
+        session = make_session()
 
         callback = AsyncMock()
         session.on_transcript = callback
         assert session.on_transcript == callback
 
-    def test_on_speech_started_callback_settable(self):
+    def test_on_speech_started_callback_settable(self, make_session):
         """VoiceLiveSession should allow setting on_speech_started callback."""
-        from src.voice_live import VoiceLiveSession
-
-        session = VoiceLiveSession(
-            endpoint="https://test.api.cognitive.microsoft.com/",
-            api_key="test-key"
-        )
+        session = make_session()
 
         callback = AsyncMock()
         session.on_speech_started = callback
         assert session.on_speech_started == callback
 
-    def test_on_status_callback_settable(self):
+    def test_on_status_callback_settable(self, make_session):
         """VoiceLiveSession should allow setting on_status callback."""
-        from src.voice_live import VoiceLiveSession
-
-        session = VoiceLiveSession(
-            endpoint="https://test.api.cognitive.microsoft.com/",
-            api_key="test-key"
-        )
+        session = make_session()
 
         callback = AsyncMock()
         session.on_status = callback
@@ -193,52 +164,441 @@ class TestVoiceLiveSessionCallbacks:
 class TestVoiceLiveSessionSendAudio:
     """Tests for send_audio() method behavior."""
 
-    @pytest.mark.asyncio
-    async def test_send_audio_accepts_base64_string(self):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_send_audio_accepts_base64_string(self, make_session):
         """send_audio() should accept a base64 encoded string."""
-        from src.voice_live import VoiceLiveSession
-
-        session = VoiceLiveSession(
-            endpoint="https://test.api.cognitive.microsoft.com/",
-            api_key="test-key"
-        )
+        session = make_session()
 
         # Mock the internal connection to avoid real API calls
-        session._connection = AsyncMock()
-        session._connection.input_audio_buffer = AsyncMock()
-        session._connection.input_audio_buffer.append = AsyncMock()
+        session._ws = AsyncMock()
 
         # This should not raise an exception
         base64_audio = "SGVsbG8gV29ybGQ="  # "Hello World" in base64
         await session.send_audio(base64_audio)
 
-    @pytest.mark.asyncio
-    async def test_send_audio_raises_without_connection(self):
-        """send_audio() should raise error if not connected."""
-        from src.voice_live import VoiceLiveSession
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_send_audio_frames_base64_without_encoder(self, make_session, voice_live_module):
+        """Plain base64 strings are framed from the template, not the JSON encoder."""
+        session = make_session()
+        session._ws = AsyncMock()
+
+        with patch.object(voice_live_module, "_dumps") as dumps:
+            await session.send_audio("SGVsbG8gV29ybGQ=")
+
+        dumps.assert_not_called()
+        frame = json.loads(session._ws.send.await_args.args[0])
+        assert frame == {"type": "input_audio_buffer.append", "audio": "SGVsbG8gV29ybGQ="}
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_send_audio_escapes_non_base64_string(self, make_session):
+        """Strings outside the base64 alphabet can't break out of the frame."""
+        session = make_session()
+        session._ws = AsyncMock()
+
+        payload = 'AAA=","type":"response.create'
+        await session.send_audio(payload)
+
+        frame = json.loads(session._ws.send.await_args.args[0])
+        assert frame == {"type": "input_audio_buffer.append", "audio": payload}
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_send_audio_bytes_encodes_pcm_once(self, make_session):
+        """send_audio_bytes() should base64-encode raw PCM exactly once."""
+        session = make_session()
+        session._ws = AsyncMock()
 
-        session = VoiceLiveSession(
-            endpoint="https://test.api.cognitive.microsoft.com/",
-            api_key="test-key"
-        )
+        pcm = b"\x00\x00\xff\x7f\x01\x80"
+        await session.send_audio_bytes(pcm)
+
+        session._ws.send.assert_awaited_once()
+        frame = json.loads(session._ws.send.await_args.args[0])
+        assert frame["type"] == "input_audio_buffer.append"
+        assert base64.b64decode(frame["audio"]) == pcm
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_send_audio_accepts_raw_bytes(self, make_session):
+        """send_audio() routes raw PCM bytes through a single base64 encode."""
+        session = make_session()
+        session._ws = AsyncMock()
+
+        pcm = b"\x01\x02\x03\x04"
+        await session.send_audio(pcm)
+
+        frame = json.loads(session._ws.send.await_args.args[0])
+        assert base64.b64decode(frame["audio"]) == pcm
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_send_audio_raises_without_connection(self, make_session):
+        """send_audio() should raise error if not connected."""
+        session = make_session()
 
         # Should raise some kind of error when not connected
         with pytest.raises(Exception):
             await session.send_audio("SGVsbG8=")
 
 
+class TestVoiceLiveSessionSlots:
+    """Tests for the slotted session layout."""
+
+    def test_session_has_no_instance_dict(self, make_session):
+        """VoiceLiveSession uses __slots__, so unknown attributes are rejected."""
+        session = make_session()
+
+        assert not hasattr(session, "__dict__")
+        with pytest.raises(AttributeError):
+            session.not_an_attribute = 1
+
+
 class TestVoiceLiveSessionContextManager:
     """Tests for async context manager support."""
 
-    def test_supports_async_context_manager(self):
+    def test_supports_async_context_manager(self, make_session):
         """VoiceLiveSession should support async context manager protocol."""
-        from src.voice_live import VoiceLiveSession
-
-        session = VoiceLiveSession(
-            endpoint="https://test.api.cognitive.microsoft.com/",
-            api_key="test-key"
-        )
+        session = make_session()
 
         # Should have __aenter__ and __aexit__ methods
         assert hasattr(session, '__aenter__')
         assert hasattr(session, '__aexit__')
+
+
+class TestVoiceLiveSessionTools:
+    """Tests for tool conversion in the session config."""
+
+    def test_default_tools_converted_once(self, voice_live_module):
+        """Sessions using MEMORY_TOOLS share the precomputed conversion."""
+        from src.memory_tools import MEMORY_TOOLS
+
+        assert [t["name"] for t in voice_live_module._DEFAULT_OPENAI_TOOLS] == [
+            t["name"] for t in MEMORY_TOOLS
+        ]
+        assert voice_live_module._to_openai_tools(MEMORY_TOOLS) == voice_live_module._DEFAULT_OPENAI_TOOLS
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_default_session_update_reused(self, make_session):
+        """Sessions with default tools send the same cached session.update frame."""
+        frames = []
+        for _ in range(2):
+            session = make_session(instructions="Be brief.")
+            session._ws = AsyncMock()
+            session._ws.recv.return_value = json.dumps({"type": "session.updated"})
+            await session._configure_session()
+            frames.append(session._ws.send.await_args.args[0])
+
+        assert frames[0] is frames[1]
+        update = json.loads(frames[0])
+        assert update["type"] == "session.update"
+        assert update["session"]["instructions"] == "Be brief."
+        assert update["session"]["tool_choice"] == "auto"
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_configure_session_sends_tools(self, make_session):
+        """_configure_session() sends the converted tools in session.update."""
+        session = make_session(tools=[{"type": "function", "name": "custom", "parameters": {}}])
+        session._ws = AsyncMock()
+        session._ws.recv.return_value = json.dumps({"type": "session.updated"})
+
+        await session._configure_session()
+
+        update = json.loads(session._ws.send.await_args.args[0])
+        assert update["session"]["tools"] == [
+            {"type": "function", "name": "custom", "description": "", "parameters": {}}
+        ]
+
+
+class TestVoiceLiveSessionEvents:
+    """Tests for server event dispatch."""
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_audio_delta_aliases_reach_on_audio(self, make_session):
+        """Both audio delta event names are batched into one on_audio call."""
+        session = make_session()
+        session.on_audio = AsyncMock()
+
+        await session._handle_event({"type": "response.audio.delta", "delta": "AAA="})
+        await session._handle_event({"type": "response.output_audio.delta", "delta": "BBB="})
+        session.on_audio.assert_not_awaited()
+        await session._handle_event({"type": "response.done"})
+
+        session.on_audio.assert_awaited_once()
+        (audio,) = session.on_audio.await_args.args
+        assert base64.b64decode(audio) == base64.b64decode("AAA=") + base64.b64decode("BBB=")
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_full_audio_batch_flushed_immediately(self, make_session, voice_live_module):
+        """A full batch is delivered without waiting for the window."""
+        session = make_session()
+        session.on_audio = AsyncMock()
+        chunks = [bytes([i]) * 5 for i in range(voice_live_module.AUDIO_BATCH_MAX)]
+
+        for chunk in chunks:
+            await session._handle_event(
+                {"type": "response.audio.delta", "delta": base64.b64encode(chunk).decode()}
+            )
+
+        session.on_audio.assert_awaited_once()
+        assert base64.b64decode(session.on_audio.await_args.args[0]) == b"".join(chunks)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_empty_deltas_not_buffered(self, make_session):
+        """Empty audio and transcript deltas never reach the batchers."""
+        session = make_session()
+        session.on_audio = AsyncMock()
+        session.on_transcript = AsyncMock()
+
+        await session._handle_event({"type": "response.audio.delta", "delta": ""})
+        await session._handle_event({"type": "response.audio_transcript.delta", "delta": ""})
+
+        assert session._audio._timer is None
+        assert session._transcript._timer is None
+        await session._handle_event({"type": "response.done"})
+        session.on_audio.assert_not_awaited()
+        session.on_transcript.assert_not_awaited()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_speech_started_discards_buffered_audio(self, make_session):
+        """Barge-in drops audio that hasn't been delivered yet."""
+        session = make_session()
+        session.on_audio = AsyncMock()
+
+        await session._handle_event({"type": "response.audio.delta", "delta": "AAA="})
+        await session._handle_event({"type": "input_audio_buffer.speech_started"})
+        await session._handle_event({"type": "response.done"})
+
+        session.on_audio.assert_not_awaited()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_audio_routing_follows_callback_assignment(self, make_session):
+        """Reassigning or clearing on_audio re-routes audio deltas."""
+        session = make_session()
+        first, second = AsyncMock(), []
+        event = {"type": "response.audio.delta", "delta": "AAA="}
+
+        session.on_audio = first
+        await session._handle_event(event)
+        await session._audio.flush()
+        session.on_audio = second.append
+        await session._handle_event(event)
+        await session._audio.flush()
+        session.on_audio = None
+        await session._handle_event(event)
+        await session._audio.flush()
+
+        first.assert_awaited_once_with("AAA=")
+        assert second == ["AAA="]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_speech_started_updates_status(self, make_session):
+        """speech_started fires on_speech_started and a listening status."""
+        session = make_session()
+        session.on_speech_started = AsyncMock()
+        session.on_status = AsyncMock()
+
+        await session._handle_event({"type": "input_audio_buffer.speech_started"})
+
+        session.on_speech_started.assert_awaited_once_with()
+        session.on_status.assert_awaited_once_with("listening")
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_unknown_event_ignored(self, make_session):
+        """Unhandled event types are ignored without error."""
+        session = make_session()
+        session.on_status = AsyncMock()
+
+        await session._handle_event({"type": "rate_limits.updated"})
+
+        session.on_status.assert_not_awaited()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_sync_callback_invoked(self, make_session):
+        """Plain (sync) callbacks are called with the event payload."""
+        session = make_session()
+        received = []
+        session.on_audio = received.append
+
+        await session._handle_event({"type": "response.audio.delta", "delta": "AAA="})
+        await session._audio.flush()
+
+        assert session.on_audio == received.append
+        assert received == ["AAA="]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_transcript_deltas_coalesced_until_response_done(self, make_session):
+        """Transcript deltas are delivered as one string before the ready status."""
+        session = make_session()
+        calls = []
+        session.on_transcript = lambda text: calls.append(("transcript", text))
+        session.on_status = lambda status: calls.append(("status", status))
+
+        for delta in ("Hel", "lo ", "there"):
+            await session._handle_event({"type": "response.audio_transcript.delta", "delta": delta})
+        assert calls == []
+
+        await session._handle_event({"type": "response.done"})
+
+        assert calls == [("transcript", "Hello there"), ("status", "ready")]
+        assert session._transcript._timer is None
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_transcript_flushed_after_window(self, make_session, voice_live_module):
+        """Buffered transcript text is delivered once the window elapses."""
+        session = make_session()
+        session.on_transcript = AsyncMock()
+
+        await session._handle_event({"type": "response.output_audio_transcript.delta", "delta": "a"})
+        await session._handle_event({"type": "response.output_audio_transcript.delta", "delta": "b"})
+        await asyncio.sleep(voice_live_module.TRANSCRIPT_FLUSH_SECONDS * 3)
+
+        session.on_transcript.assert_awaited_once_with("ab")
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_process_events_dispatches_until_closed(self, make_session):
+        """_process_events parses each message and dispatches it in order."""
+        session = make_session()
+        messages = [
+            json.dumps({"type": "input_audio_buffer.speech_stopped"}),
+            json.dumps({"type": "response.audio.delta", "delta": "AAA="}),
+            json.dumps({"type": "response.done"}),
+        ]
+
+        class FakeWebSocket:
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                if not messages:
+                    raise StopAsyncIteration
+                return messages.pop(0)
+
+        session._ws = FakeWebSocket()
+        calls = []
+        session.on_status = lambda status: calls.append(("status", status))
+        session.on_audio = lambda audio: calls.append(("audio", audio))
+
+        await session._process_events()
+
+        assert calls == [("status", "processing"), ("audio", "AAA="), ("status", "ready")]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_process_events_scans_compact_audio_frames(self, make_session, voice_live_module):
+        """Compact audio delta frames reach on_audio without a full parse."""
+        session = make_session()
+        messages = [
+            '{"type":"response.audio.delta","event_id":"e1","delta":"AAA="}',
+            '{"type":"response.done"}',
+        ]
+
+        class FakeWebSocket:
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                if not messages:
+                    raise StopAsyncIteration
+                return messages.pop(0)
+
+        session._ws = FakeWebSocket()
+        received = []
+        session.on_audio = received.append
+        loads = MagicMock(side_effect=voice_live_module._loads)
+
+        with patch.object(voice_live_module, "_loads", loads):
+            await session._process_events()
+
+        assert received == ["AAA="]
+        loads.assert_called_once_with('{"type":"response.done"}')
+
+    @pytest.mark.parametrize(
+        ("frame", "expected"),
+        [
+            ('{"type":"response.output_audio.delta","item_id":"i","delta":"QUJD"}', "QUJD"),
+            ('{"type":"response.audio.delta","delta":""}', ""),
+            ('{"type": "response.audio.delta", "delta": "QUJD"}', None),
+            ('{"type":"response.audio.delta.extra","delta":"QUJD"}', None),
+            ('{"type":"response.audio_transcript.delta","delta":"hi"}', None),
+            (b'{"type":"response.audio.delta","delta":"QUJD"}', None),
+        ],
+    )
+    def test_scan_audio_delta(self, voice_live_module, frame, expected):
+        """Only compact audio delta frames take the scanning fast path."""
+        assert voice_live_module._scan_audio_delta(frame) == expected
+
+    @pytest.mark.parametrize(
+        ("chunks", "concatenated"),
+        [
+            ([b"abc", b"def", b"gh"], True),
+            ([b"abcdef", b"ghi", b"j"], True),
+            ([b"ab", b"cdef"], False),
+            ([b"abc", b"d", b"efg"], False),
+        ],
+    )
+    def test_join_base64(self, voice_live_module, chunks, concatenated):
+        """Unpadded chunks are concatenated; padded ones are re-encoded."""
+        encoded = [base64.b64encode(chunk).decode() for chunk in chunks]
+
+        joined = voice_live_module._join_base64(encoded)
+
+        assert base64.b64decode(joined) == b"".join(chunks)
+        assert (joined == "".join(encoded)) is concatenated
+
+
+class TestVoiceLiveSessionFunctionCalls:
+    """Tests for function call round trips."""
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_function_result_sent_then_response_requested(self, make_session):
+        """The tool result is sent as function_call_output, then response.create."""
+        session = make_session(user_id="u1")
+        session._ws = AsyncMock()
+        result = {"success": True, "memories": [{"text": "likes tea"}], "count": 1}
+
+        with patch("src.voice_live.handle_tool_call", AsyncMock(return_value=result)) as tool:
+            await session._handle_event({
+                "type": "response.function_call_arguments.done",
+                "name": "search_memory",
+                "call_id": "call_1",
+                "arguments": '{"query": "drinks"}',
+            })
+
+        tool.assert_awaited_once_with("search_memory", {"query": "drinks", "user_id": "u1"})
+        frames = [json.loads(c.args[0]) for c in session._ws.send.await_args_list]
+        assert frames[0]["type"] == "conversation.item.create"
+        assert frames[0]["item"]["call_id"] == "call_1"
+        assert json.loads(frames[0]["item"]["output"]) == result
+        assert frames[1] == {"type": "response.create"}
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_response_requested_before_callback(self, make_session):
+        """on_function_call runs only after the result and response.create are sent."""
+        session = make_session()
+        session._ws = AsyncMock()
+        sends_seen = []
+        session.on_function_call = lambda *args: sends_seen.append(session._ws.send.await_count)
+
+        with patch("src.voice_live.handle_tool_call", AsyncMock(return_value={"success": True})):
+            await session._handle_function_call({"name": "search_memory", "call_id": "c", "arguments": "{}"})
+
+        assert sends_seen == [2]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_unknown_tool_rejected_without_handler(self, make_session):
+        """Unknown tools get an error result without calling handle_tool_call."""
+        session = make_session()
+        session._ws = AsyncMock()
+
+        with patch("src.voice_live.handle_tool_call", AsyncMock()) as tool:
+            await session._handle_function_call({"name": "launch_rocket", "call_id": "c", "arguments": "{}"})
+
+        tool.assert_not_awaited()
+        output = json.loads(json.loads(session._ws.send.await_args_list[0].args[0])["item"]["output"])
+        assert output == {"success": False, "error": "Unknown tool: launch_rocket"}
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_invalid_arguments_treated_as_empty(self, make_session):
+        """Unparseable arguments fall back to an empty dict."""
+        session = make_session(user_id="u1")
+        session._ws = AsyncMock()
+
+        with patch("src.voice_live.handle_tool_call", AsyncMock(return_value={})) as tool:
+            await session._handle_function_call({"name": "add_memory", "call_id": "c", "arguments": "{oops"})
+
+        tool.assert_awaited_once_with("add_memory", {"user_id": "u1"})
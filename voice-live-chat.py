@@ -3,9 +3,10 @@ Voice Live Chat - Azure Voice Live API with proper barge-in support
 """
 from __future__ import annotations
 import asyncio
-import base64
+import binascii
+import collections
+import contextlib
 import os
-import queue
 import signal
 from typing import Optional, Union
 
@@ -25,6 +26,11 @@ from azure.ai.voicelive.models import (
 from dotenv import load_dotenv
 import pyaudio
 
+try:
+    import uvloop
+except ImportError:  # uvloop is an optional speedup; fall back to the stdlib loop
+    uvloop = None
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -49,7 +55,10 @@ if not ENDPOINT or not API_KEY:
 
 class AudioPlaybackPacket:
     """Represents a packet for audio playback."""
-    def __init__(self, seq_num: int, data: Optional[bytes]):
+
+    __slots__ = ("seq_num", "data")
+
+    def __init__(self, seq_num: int, data: Optional[memoryview]):
         self.seq_num = seq_num
         self.data = data
 
@@ -72,25 +81,37 @@ class AudioProcessor:
         self.input_stream = None
         self.output_stream = None
 
-        # Playback queue
-        self.playback_queue: queue.Queue[AudioPlaybackPacket] = queue.Queue()
+        # Playback queue; deque append/popleft are atomic, so the asyncio
+        # producer and PortAudio consumer threads need no lock
+        self.playback_queue: collections.deque[AudioPlaybackPacket] = collections.deque()
         self.playback_base = 0
         self.next_seq_num = 0
 
+        # Captured audio awaiting send; filled by the PortAudio thread and
+        # drained by one task on the event loop
+        self.send_queue: collections.deque[str] = collections.deque()
+        self.send_event: Optional[asyncio.Event] = None
+        self.send_task: Optional[asyncio.Task] = None
+
     def start_capture(self):
         """Start capturing audio from microphone."""
         def _capture_callback(in_data, _frame_count, _time_info, _status_flags):
-            audio_base64 = base64.b64encode(in_data).decode("utf-8")
-            asyncio.run_coroutine_threadsafe(
-                self.connection.input_audio_buffer.append(audio=audio_base64),
-                self.loop
-            )
+            # One C call; the SDK serializes audio as a base64 str
+            audio_base64 = binascii.b2a_base64(in_data, newline=False).decode("ascii")
+            self.send_queue.append(audio_base64)
+            # Skip the wake-up if the sender hasn't cleared the last one yet;
+            # it drains the queue after clearing, so this chunk is still sent
+            if not self.send_event.is_set():
+                self.loop.call_soon_threadsafe(self.send_event.set)
             return (None, pyaudio.paContinue)
 
         if self.input_stream:
             return
 
-        self.loop = asyncio.get_event_loop()
+        # Called from an event handler, so a loop is always running here
+        self.loop = asyncio.get_running_loop()
+        self.send_event = asyncio.Event()
+        self.send_task = self.loop.create_task(self._send_captured_audio())
 
         self.input_stream = self.audio.open(
             format=self.format,
@@ -101,38 +122,60 @@ class AudioProcessor:
             stream_callback=_capture_callback
         )
 
+    async def _send_captured_audio(self):
+        """Send captured audio chunks to the connection as they arrive."""
+        pending = self.send_queue
+        event = self.send_event
+        append = self.connection.input_audio_buffer.append
+        while True:
+            await event.wait()
+            event.clear()
+            while pending:
+                await append(audio=pending.popleft())
+
     def start_playback(self):
         """Start audio playback system."""
         if self.output_stream:
             return
 
-        remaining = bytes()
+        sample_size = pyaudio.get_sample_size(pyaudio.paInt16)
+        empty = memoryview(b"")
+        remaining = empty
+        # Reused across callbacks; only resized if PortAudio changes frame_count
+        buf = bytearray()
+        silence = empty
 
         def _playback_callback(_in_data, frame_count, _time_info, _status_flags):
-            nonlocal remaining
-            frame_count *= pyaudio.get_sample_size(pyaudio.paInt16)
-
-            out = remaining[:frame_count]
-            remaining = remaining[frame_count:]
-
-            while len(out) < frame_count:
+            nonlocal remaining, buf, silence
+            frame_count *= sample_size
+            if len(buf) != frame_count:
+                buf = bytearray(frame_count)
+                silence = memoryview(bytes(frame_count))
+
+            pos = min(len(remaining), frame_count)
+            buf[:pos] = remaining[:pos]
+            # Release a fully played packet so its bytes can be freed
+            remaining = remaining[pos:] if pos < len(remaining) else empty
+
+            while pos < frame_count:
                 try:
-                    packet = self.playback_queue.get_nowait()
-                except queue.Empty:
-                    out = out + bytes(frame_count - len(out))
-                    return (out, pyaudio.paContinue)
+                    packet = self.playback_queue.popleft()
+                except IndexError:
+                    buf[pos:] = silence[pos:]
+                    return (bytes(buf), pyaudio.paContinue)
 
                 if not packet or not packet.data:
                     break
 
-                if packet.seq_num < self.playback_base:
-                    continue
-
-                num_to_take = frame_count - len(out)
-                out = out + packet.data[:num_to_take]
-                remaining = packet.data[num_to_take:]
+                data = packet.data
+                num_to_take = min(len(data), frame_count - pos)
+                buf[pos:pos + num_to_take] = data[:num_to_take]
+                remaining = data[num_to_take:] if num_to_take < len(data) else empty
+                pos += num_to_take
 
-            return (out, pyaudio.paContinue) if len(out) >= frame_count else (out, pyaudio.paComplete)
+            if pos >= frame_count:
+                return (bytes(buf), pyaudio.paContinue)
+            return (bytes(buf[:pos]), pyaudio.paComplete)
 
         self.output_stream = self.audio.open(
             format=self.format,
@@ -149,17 +192,23 @@ class AudioProcessor:
         return seq
 
     def queue_audio(self, audio_data: Optional[bytes]):
-        """Queue audio data for playback."""
-        self.playback_queue.put(
+        """Queue audio data for playback.
+
+        Data is wrapped in a byte memoryview so the playback callback can
+        split packets across frames without copying.
+        """
+        self.playback_queue.append(
             AudioPlaybackPacket(
                 seq_num=self._get_and_increase_seq_num(),
-                data=audio_data
+                data=memoryview(audio_data).cast("B") if audio_data else audio_data
             )
         )
 
     def skip_pending_audio(self):
         """Skip current audio in playback queue (for interruption)."""
         self.playback_base = self._get_and_increase_seq_num()
+        # Drop stale packets here rather than in the realtime callback
+        self.playback_queue.clear()
 
     def shutdown(self):
         """Clean up audio resources."""
@@ -168,6 +217,10 @@ class AudioProcessor:
             self.input_stream.close()
             self.input_stream = None
 
+        if self.send_task:
+            self.send_task.cancel()
+            self.send_task = None
+
         if self.output_stream:
             self.skip_pending_audio()
             self.queue_audio(None)
@@ -244,61 +297,86 @@ class VoiceLiveAssistant:
         await self.connection.session.update(session=session_config)
 
     async def _process_events(self):
-        """Process events from Voice Live connection."""
-        async for event in self.connection:
-            await self._handle_event(event)
+        """Process events from Voice Live connection.
 
-    async def _handle_event(self, event):
-        """Handle different types of Voice Live events."""
-        ap = self.audio_processor
-
-        if event.type == ServerEventType.SESSION_UPDATED:
-            print(f"✅ Connected: {event.session.id}")
-            self.session_ready = True
-            ap.start_capture()
+        Handlers do no I/O, so they are called directly rather than awaited.
+        """
+        handlers = self._HANDLERS
+        async for event in self.connection:
+            handler = handlers.get(event.type)
+            if handler:
+                handler(self, event)
 
-        elif event.type == ServerEventType.INPUT_AUDIO_BUFFER_SPEECH_STARTED:
-            print("🎤 Listening... (you can interrupt!)")
-            ap.skip_pending_audio()  # Immediately stop playback for barge-in
+    def _on_session_updated(self, event):
+        print(f"✅ Connected: {event.session.id}")
+        self.session_ready = True
+        self.audio_processor.start_capture()
 
-        elif event.type == ServerEventType.INPUT_AUDIO_BUFFER_SPEECH_STOPPED:
-            print("🤔 Processing...")
+    def _on_speech_started(self, _event):
+        print("🎤 Listening... (you can interrupt!)")
+        self.audio_processor.skip_pending_audio()  # Immediately stop playback for barge-in
 
-        elif event.type == ServerEventType.RESPONSE_CREATED:
-            pass  # Response started
+    def _on_speech_stopped(self, _event):
+        print("🤔 Processing...")
 
-        elif event.type == ServerEventType.RESPONSE_AUDIO_DELTA:
-            ap.queue_audio(event.delta)
+    def _on_audio_delta(self, event):
+        self.audio_processor.queue_audio(event.delta)
 
-        elif event.type == ServerEventType.RESPONSE_AUDIO_TRANSCRIPT_DELTA:
-            print(f"{event.delta}", end="", flush=True)
+    def _on_transcript_delta(self, event):
+        print(f"{event.delta}", end="", flush=True)
 
-        elif event.type == ServerEventType.RESPONSE_AUDIO_DONE:
-            print("\n🎤 Ready...")
+    def _on_audio_done(self, _event):
+        print("\n🎤 Ready...")
 
-        elif event.type == ServerEventType.RESPONSE_DONE:
-            pass  # Response complete
+    def _on_error(self, event):
+        msg = event.error.message
+        if "no active response" not in msg.lower():
+            print(f"❌ Error: {msg}")
 
-        elif event.type == ServerEventType.ERROR:
-            msg = event.error.message
-            if "no active response" not in msg.lower():
-                print(f"❌ Error: {msg}")
+    # Event type -> handler; RESPONSE_CREATED and RESPONSE_DONE need no handling
+    _HANDLERS = {
+        ServerEventType.SESSION_UPDATED: _on_session_updated,
+        ServerEventType.INPUT_AUDIO_BUFFER_SPEECH_STARTED: _on_speech_started,
+        ServerEventType.INPUT_AUDIO_BUFFER_SPEECH_STOPPED: _on_speech_stopped,
+        ServerEventType.RESPONSE_AUDIO_DELTA: _on_audio_delta,
+        ServerEventType.RESPONSE_AUDIO_TRANSCRIPT_DELTA: _on_transcript_delta,
+        ServerEventType.RESPONSE_AUDIO_DONE: _on_audio_done,
+        ServerEventType.ERROR: _on_error,
+    }
 
 
 async def main():
     assistant = VoiceLiveAssistant()
 
-    def signal_handler(_sig, _frame):
-        raise KeyboardInterrupt()
-
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # Stop through the loop rather than raising from a signal handler
+    loop = asyncio.get_running_loop()
+    stop_event = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C still raises KeyboardInterrupt
 
+    start_task = asyncio.create_task(assistant.start())
+    stop_task = asyncio.create_task(stop_event.wait())
     try:
-        await assistant.start()
-    except KeyboardInterrupt:
-        print("\n👋 Goodbye!")
+        await asyncio.wait({start_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        stop_task.cancel()
+
+    if not stop_event.is_set():
+        start_task.result()  # Session ended on its own; re-raise any error
+        return
+
+    # Cancelling unwinds start(), which closes the connection and audio
+    start_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await start_task
+    print("\n👋 Goodbye!")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())